@@ -583,6 +583,8 @@ function addmarker(data, options) {
 
     markers.addLayer(marker);
     map.addLayer(markers);
+    // A marker with its popup click handler is on the map (E2E tests wait on this)
+    window.__popupHandlersReady = true;
 
     if (cluster_selected != null && typeof cluster_selected.spiderfy === 'function') {
         try {
@@ -903,6 +905,8 @@ function addClusterMarker(clusterData) {
     
     markers.addLayer(marker);
     map.addLayer(markers);
+    // A marker with its popup click handler is on the map (E2E tests wait on this)
+    window.__popupHandlersReady = true;
 
     if (cluster_selected != null && typeof cluster_selected.spiderfy === 'function') {
         try {
@@ -9,27 +9,94 @@ Handles:
 """
 
 import os
+import re
+import json
+import asyncio
 import logging
-import time
 import requests
-from typing import List, Dict, Optional, Iterator
+from typing import Any, List, Dict, Optional, Iterator
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing as mp
 from typing import Iterable, Tuple, Set
 from datetime import datetime, timezone
 import traceback
 from enum import IntEnum
+from functools import lru_cache
 from peewee import DatabaseError, IntegrityError
 import psycopg2
+import numpy as np
 
 
-from shared.models.models import IngestionRecord, validate_record
+from shared.models.models import IngestionRecord, NormalizedItem, validate_record
 from shared.models.database import database
 from location import LocationGetter
 
 import spacy
 
+try:
+    import ahocorasick  # pyahocorasick; optional gazetteer pre-pass
+except ImportError:
+    ahocorasick = None
+
+try:
+    import msgspec  # optional fast decoder for memory-store records
+except ImportError:
+    msgspec = None
+
 logger = logging.getLogger(__name__)
 
+# "lat, lon" pairs that carry a coordinate marker: a degree sign, an N/S/E/W
+# hemisphere, or a lat/lon keyword, e.g. "45.5°N 13.7°E", "36.12 N, 97.07 W",
+# "lat: 36.12, lon: -97.07". Bare decimal pairs ("fell 3.25, 4.10",
+# "M 5.4, 10.0 km depth") are too often prices, magnitudes or depths.
+_COORD_RE = re.compile(
+    r"(?:\b(?P<lat_kw>(?i:lat(?:itude)?|coord(?:inate)?s?))\b\s*[:=]?\s*)?"
+    r"(?<![\w.])(?P<lat>[-+]?\d{1,2}\.\d+)\s*(?P<lat_deg>°)?\s*(?P<ns>[NS])?\s*,?\s*"
+    r"(?:\b(?P<lon_kw>(?i:lon(?:g(?:itude)?)?))\b\s*[:=]?\s*)?"
+    r"(?<![\w.])(?P<lon>[-+]?\d{1,3}\.\d+)\s*(?P<lon_deg>°)?\s*(?P<ew>[EW])?(?![\w.])"
+)
+
+
+def _extract_coordinates(text: str) -> Optional[Tuple[float, float]]:
+    """Returns the first plausible, explicitly marked (lat, lon) pair embedded in text, or None."""
+    for m in _COORD_RE.finditer(text):
+        if not (m["lat_deg"] or m["lon_deg"] or m["ns"] or m["ew"] or m["lat_kw"] or m["lon_kw"]):
+            continue
+        lat = float(m["lat"])
+        lon = float(m["lon"])
+        if m["ns"] == "S":
+            lat = -abs(lat)
+        if m["ew"] == "W":
+            lon = -abs(lon)
+        if -90 <= lat <= 90 and -180 <= lon <= 180:
+            return lat, lon
+    return None
+
+
+# Decodes NDJSON lines straight into IngestionRecord (dataclass) in C, ignoring
+# unknown fields; lenient so numeric strings etc. are still coerced.
+_RECORD_DECODER = msgspec.json.Decoder(IngestionRecord, strict=False) if msgspec is not None else None
+
+
+def _decode_record(line: bytes) -> IngestionRecord:
+    if _RECORD_DECODER is not None:
+        try:
+            record = _RECORD_DECODER.decode(line)
+        except msgspec.ValidationError:
+            pass  # let from_dict decide (and report) on shapes msgspec won't coerce
+        else:
+            # msgspec also fills the get_hash() cache field from a "_hash" key;
+            # the hash must come from source/source_id, never from the input
+            record._hash = None
+            return record
+    return IngestionRecord.from_dict(json.loads(line))
+
+
+# Max characters of title+text handed to NER per record
+_NER_MAX_CHARS = 4000
+
+
 class StoreResult(IntEnum):
     INSERTED = 1
     DUPLICATE = 0
@@ -44,6 +111,37 @@ def _to_utc_from_epoch_seconds(ts: float | int) -> datetime:
     return datetime.fromtimestamp(float(ts), tz=timezone.utc)
 
 
+# datetime64[s] can represent far more than datetime.datetime; clamp to years 1..9999.
+_MIN_EPOCH_S = -62135596800
+_MAX_EPOCH_S = 253402300799
+
+
+def _to_utc_from_epoch_column(values: List[object]) -> List[Optional[datetime]]:
+    """
+    Vectorized epoch-seconds -> tz-aware UTC datetimes for a whole batch.
+    Entries that are not numeric or out of range come back as None.
+    """
+    try:
+        arr = np.asarray(values, dtype="float64")
+    except (TypeError, ValueError):
+        # Mixed junk in the column: fall back to scalar conversion.
+        out: List[Optional[datetime]] = []
+        for v in values:
+            try:
+                out.append(_to_utc_from_epoch_seconds(v))
+            except (ValueError, OSError, TypeError, OverflowError):
+                out.append(None)
+        return out
+
+    valid = np.isfinite(arr) & (arr >= _MIN_EPOCH_S) & (arr <= _MAX_EPOCH_S)
+    micros = np.where(valid, np.round(arr * 1e6), 0).astype("int64")
+    naive = micros.astype("datetime64[us]").tolist()
+    return [
+        dt.replace(tzinfo=timezone.utc) if ok else None
+        for dt, ok in zip(naive, valid.tolist())
+    ]
+
+
 def _parse_published_at(value: object) -> Optional[datetime]:
     if value is None:
         return None
@@ -62,6 +160,83 @@ def _parse_published_at(value: object) -> Optional[datetime]:
     raise TypeError(f"published_at must be datetime|str|None, got {type(value)!r}")
 
 
+def _build_row(
+    record: IngestionRecord, collected_at_dt: Optional[datetime]
+) -> Tuple[StoreResult, Optional[Dict[str, Any]]]:
+    """
+    Normalizes a record into a NormalizedItem column dict ready for insert.
+    collected_at_dt is the batch-converted collected_at (None if invalid).
+    Returns (result, None) when the record must be skipped.
+    """
+    if record.source == "mastodon" and "emsc" in (record.source_id or ""):
+        logger.debug("Ignoring emsc mastodon item %s:%s", record.source, record.source_id)
+        return StoreResult.IGNORED, None
+
+    if not record.has_location():
+        logger.debug("No location data for %s:%s", record.source, record.source_id)
+        return StoreResult.NO_LOCATION, None
+
+    if record.published_at is None:
+        logger.debug("Missing published_at for %s:%s", record.source, record.source_id)
+        return StoreResult.MISSING_PUBLISHED_AT, None
+
+    if collected_at_dt is None:
+        logger.warning(
+            "Invalid collected_at for %s:%s (%r)",
+            record.source, record.source_id, record.collected_at
+        )
+        return StoreResult.INVALID_COLLECTED_AT, None
+
+    try:
+        published_at_dt = _parse_published_at(record.published_at)
+    except (ValueError, TypeError) as e:
+        logger.warning(
+            "Invalid published_at for %s:%s (%r): %s",
+            record.source, record.source_id, record.published_at, e
+        )
+        return StoreResult.INVALID_PUBLISHED_AT, None
+
+    if published_at_dt is None:
+        return StoreResult.MISSING_PUBLISHED_AT, None
+
+    item = NormalizedItem(
+        source=record.source,
+        source_id=record.source_id,
+        collected_at=collected_at_dt,
+        published_at=published_at_dt,
+        title=record.title,
+        text=record.text,
+        url=record.url,
+        location_name=record.location_name,
+        lat=record.lat,
+        lon=record.lon,
+        author=record.author,
+    )
+
+    try:
+        item.set_media_urls(record.media_urls)
+        item.set_entities(record.entities)
+    except (TypeError, ValueError) as e:
+        logger.warning("JSON serialization error for %s:%s: %s", record.source, record.source_id, e)
+        item.media_urls = None
+        item.entities = None
+
+    data = item.__data__.copy()
+    data.pop(item._meta.primary_key.name, None)
+    return StoreResult.INSERTED, data
+
+
+def _build_row_safe(
+    record: IngestionRecord, collected_at_dt: Optional[datetime]
+) -> Tuple[Optional[StoreResult], Optional[Dict[str, Any]]]:
+    """_build_row that logs and returns (None, None) instead of raising; safe to map in worker processes."""
+    try:
+        return _build_row(record, collected_at_dt)
+    except Exception:
+        logger.exception("Error processing record %s:%s", record.source, record.source_id)
+        return None, None
+
+
 class EventsIngestionService:
     """
     Processes IngestionRecord objects from connectors into the events database.
@@ -87,6 +262,9 @@ class EventsIngestionService:
             "location_ner_attempted": 0,
             "location_ner_found": 0,
             "location_resolved": 0,
+            "location_regex_resolved": 0,
+            "location_gazetteer_found": 0,
+            "location_ner_skipped": 0,
             "ignored":0,
             "parsing_error": 0,
         }
@@ -102,10 +280,14 @@ class EventsIngestionService:
         location_service_url = os.getenv("LOCATION_SERVICE_URL", "http://location:8787")
         self.location_getter = LocationGetter(service_url=location_service_url)
 
-        # spaCy multilingual NER model (installed in entrypoint)
+        # spaCy multilingual NER model (installed in entrypoint).
+        # Use exclude (not disable) so unused components are never loaded into memory.
         model_name = os.getenv("SPACY_MODEL", "xx_ent_wiki_sm")
-        self.nlp = spacy.load(model_name, disable=["tagger", "parser", "lemmatizer", "attribute_ruler"])
-        logger.info(f"spaCy loaded: {model_name}")
+        self.nlp = spacy.load(
+            model_name,
+            exclude=["tagger", "parser", "lemmatizer", "attribute_ruler", "senter"],
+        )
+        logger.info(f"spaCy loaded: {model_name} (pipes={self.nlp.pipe_names})")
 
         # LOC/GPE labels vary by model; keep both
         self._loc_labels = {"LOC", "GPE"}
@@ -113,19 +295,52 @@ class EventsIngestionService:
         # Optional: common false positives you observed
         self._stop_lower = set(x.strip().lower() for x in os.getenv("LOC_STOPWORDS", "man,it,der").split(",") if x.strip())
 
-        from shared.models.models import NormalizedItem
+        # Candidate filter as one memoized predicate: entity strings repeat heavily
+        # across a feed, so most checks become a single cache hit.
+        stop_lower = frozenset(self._stop_lower)
+
+        @lru_cache(maxsize=16384)
+        def candidate_ok(s: str) -> bool:
+            # Kill common junk; all-lowercase single tokens are common false positives
+            return len(s) >= 3 and s.lower() not in stop_lower and (" " in s or not s.islower())
+
+        self._candidate_ok = candidate_ok
+
+        # Optional gazetteer (one place name per line) scanned with Aho-Corasick
+        # before NER; records with a gazetteer hit that resolves skip spaCy entirely.
+        self._gazetteer = self._load_gazetteer(os.getenv("LOC_GAZETTEER_PATH"))
+
         self.NormalizedItem = NormalizedItem
 
+        # Optional process pool for row normalization (JSON serialization + model
+        # construction), sidestepping the GIL on large batches. 0 = inline.
+        workers = int(os.getenv("INGEST_WORKERS", "0"))
+        self._row_pool: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            # spawn, not fork: the service runs fetch/work threads and spaCy.
+            self._row_pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+            logger.info(f"Row normalization pool started with {workers} worker processes")
+
+    def close(self) -> None:
+        """Shut down the row normalization pool, if one was started."""
+        if self._row_pool is not None:
+            self._row_pool.shutdown(wait=True, cancel_futures=True)
+            self._row_pool = None
+
     def process_records(self, records: Iterator[IngestionRecord]) -> Dict[str, int]:
+        for batch in self._iter_batches(records):
+            self._process_batch(batch)
+        return self.stats.copy()
+
+    def _iter_batches(self, records: Iterable[IngestionRecord]) -> Iterator[List[IngestionRecord]]:
         batch: List[IngestionRecord] = []
         for record in records:
             batch.append(record)
             if len(batch) >= self.batch_size:
-                self._process_batch(batch)
+                yield batch
                 batch = []
         if batch:
-            self._process_batch(batch)
-        return self.stats.copy()
+            yield batch
 
     def _process_batch(self, records):
         if not records:
@@ -160,38 +375,28 @@ class EventsIngestionService:
         # 4) Only now do spaCy/location enrichment (expensive)
         self._enrich_locations_with_spacy(valid_records)
 
-        # 5) Store remaining records (upsert still protects races)
-        for record in valid_records:
-            try:
-                with database.atomic():
-                    res = self._store_normalized_item(record)
-            except Exception:
-                logger.exception("Error processing record %s:%s", record.source, record.source_id)
+        # 5) Normalize into rows (per-record failures stay isolated here)
+        rows: List[Dict[str, Any]] = []
+        row_records: List[IngestionRecord] = []
+        collected_at_col = _to_utc_from_epoch_column([r.collected_at for r in valid_records])
+        if self._row_pool is not None:
+            built = self._row_pool.map(_build_row_safe, valid_records, collected_at_col, chunksize=32)
+        else:
+            built = map(_build_row_safe, valid_records, collected_at_col)
+        for record, (res, row) in zip(valid_records, built):
+            if res is None:
                 self.stats["unknown_error"] += 1
                 continue
+            if row is None:
+                self._count_store_result(record, res)
+                continue
+            rows.append(row)
+            row_records.append(record)
 
-            if res == StoreResult.INSERTED:
-                self.stats["inserted"] += 1
-            elif res == StoreResult.DUPLICATE:
-                # This can still happen due to races between workers or
-                # because another process inserted after our precheck.
-                self.stats["skipped_duplicates"] += 1
-            elif res == StoreResult.NO_LOCATION:
-                self.stats["no_location_data"] += 1
-            elif res == StoreResult.MISSING_PUBLISHED_AT:
-                self.stats["missing_published_at"] += 1
-            elif res == StoreResult.INVALID_COLLECTED_AT:
-                logger.info("ERROR for record "+str(record))
-                logger.info("INVALID COLLECTED AT:"+record.collected_at)
-                self.stats["parsing_error"] += 1
-            elif res == StoreResult.INVALID_PUBLISHED_AT:
-                logger.info("ERROR for record "+str(record))
-                logger.info("INVALID PUBLISHED AT:"+record.published_at)
-                self.stats["parsing_error"] += 1
-            elif res == StoreResult.IGNORED:
-                self.stats["ignored"] += 1
-            else:
-                self.stats["unknown_error"] += 1
+        # 6) Store all rows with a single INSERT ... ON CONFLICT DO NOTHING
+        #    (upsert still protects races with other workers)
+        if rows:
+            self._store_rows(rows, row_records)
 
         logger.info("Processed batch of %d records; stats=%s", len(valid_records), self.stats)
         return self.stats.copy()
@@ -268,8 +473,8 @@ class EventsIngestionService:
 
     def _enrich_locations_with_spacy(self, records: List[IngestionRecord]) -> None:
         # Collect texts to NER only for records missing location
-        idx_map: List[int] = []
-        texts: List[str] = []
+        ner_inputs: List[Tuple[int, str]] = []
+        gaz_pending: List[Tuple[int, List[str]]] = []
 
         for i, r in enumerate(records):
             if r.has_location():
@@ -281,170 +486,257 @@ class EventsIngestionService:
             combined = (title + "\n" + text).strip()
             if not combined:
                 continue
-            idx_map.append(i)
-            texts.append(combined)
 
-        if not texts:
-            return
+            # Cheap path: many feeds embed coordinates directly in the text
+            coords = _extract_coordinates(combined)
+            if coords is not None:
+                r.lat, r.lon = coords
+                self.stats["location_regex_resolved"] += 1
+                continue
 
-        self.stats["location_ner_attempted"] += len(texts)
+            # Gazetteer path: exact known place names, no model inference
+            gaz_candidates = self._gazetteer_candidates(combined)
+            if gaz_candidates:
+                self.stats["location_gazetteer_found"] += 1
+                gaz_pending.append((i, gaz_candidates))
 
-        # spaCy pipe for throughput
-        for i, doc in enumerate(self.nlp.pipe(texts, batch_size=64)):
-            rec = records[idx_map[i]]
+            # Place names are proper nouns; all-lowercase text (cased letters but
+            # no capitals) practically never yields GPE/LOC entities.
+            if combined.islower():
+                self.stats["location_ner_skipped"] += 1
+                continue
 
-            # Extract location entities
-            candidates: List[str] = []
-            for ent in doc.ents:
-                if ent.label_ not in self._loc_labels:
-                    continue
-                s = ent.text.strip()
+            ner_inputs.append((i, combined))
 
-                # Filters to kill common junk
-                s_lower = s.lower()
-                if len(s) < 3:
-                    continue
-                if s_lower in self._stop_lower:
-                    continue
-                # Avoid all-lowercase single tokens (common false positives)
-                if " " not in s and s.islower():
-                    continue
+        gaz_resolved = self._resolve_candidates_bulk(records, gaz_pending)
 
-                candidates.append(s)
+        idx_map: List[int] = []
+        texts: List[str] = []
+        for i, combined in ner_inputs:
+            if i in gaz_resolved:
+                continue
+            idx_map.append(i)
+            # Location mentions beyond the first paragraphs rarely add anything
+            texts.append(combined[:_NER_MAX_CHARS])
 
-            # De-dup while preserving order
-            seen = set()
-            deduped: List[str] = []
-            for c in candidates:
-                k = c.lower()
-                if k not in seen:
-                    seen.add(k)
-                    deduped.append(c)
+        if not texts:
+            return
 
+        self.stats["location_ner_attempted"] += len(texts)
+
+        # spaCy pipe for throughput. Feed texts sorted by length so each
+        # mini-batch has similar-sized docs (padding is driven by the longest
+        # one), then map results back through the permutation.
+        order = sorted(range(len(texts)), key=lambda k: len(texts[k]))
+        sorted_texts = [texts[k] for k in order]
+        ner_pending: List[Tuple[int, List[str]]] = []
+        for j, doc in enumerate(self.nlp.pipe(sorted_texts, batch_size=64)):
+            deduped = self._extract_candidates(doc)
             if not deduped:
                 continue
 
             self.stats["location_ner_found"] += 1
+            ner_pending.append((idx_map[order[j]], deduped))
+
+        self._resolve_candidates_bulk(records, ner_pending)
+
+    def _resolve_candidates_bulk(
+        self, records: List[IngestionRecord], pending: List[Tuple[int, List[str]]]
+    ) -> Set[int]:
+        """
+        Resolves candidate place names for many records with the GeoNames resolver
+        and sets their locations; returns the indexes of records that got one.
+
+        Works in rounds: round k looks up the k-th candidate of every record that
+        is still unresolved, each distinct name once for the whole batch (the same
+        places recur across a news batch). This keeps first-match-wins per record.
+        """
+        resolved: Set[int] = set()
+        remaining = pending
+        for k in range(5):
+            # Distinct names for this round, in first-seen order
+            names = list(dict.fromkeys(cands[k] for _, cands in remaining if k < len(cands)))
+            if not names:
+                break
 
-            # Resolve candidates with your GeoNames resolver.
-            # Assumes LocationGetter can accept raw text; if you have a "resolve_name" method, prefer that.
-            # Here we resolve by feeding candidate strings (first match wins).
             try:
-                resolved = None
-                for cand in deduped[:5]:
-                    # If LocationGetter only exposes parse_locations_batch(texts),
-                    # we can still call it with the candidate string as "text".
-                    res_list = self.location_getter.parse_locations_batch([cand])
-                    if res_list and res_list[0]:
-                        resolved = res_list[0]
-                        break
-
-                if not resolved:
+                by_name = dict(zip(names, self.location_getter.parse_locations_batch(names)))
+            except Exception as e:
+                logger.error(f"Location resolve failed for {len(names)} candidates: {e}")
+                break
+
+            still: List[Tuple[int, List[str]]] = []
+            for i, cands in remaining:
+                if k >= len(cands):
+                    continue
+                hit = by_name.get(cands[k])
+                if not hit:
+                    still.append((i, cands))
                     continue
 
-                location_name, lat, lng, area, similarity = resolved
+                rec = records[i]
+                location_name, lat, lng, area, similarity = hit
                 rec.location_name = location_name
                 rec.lat = lat
                 rec.lon = lng
                 self.stats["location_resolved"] += 1
+                resolved.add(i)
+            remaining = still
 
-            except Exception as e:
-                logger.error(f"Location resolve failed for {rec.source}:{rec.source_id}: {e}")
+        return resolved
 
-    def _store_normalized_item(self, record: IngestionRecord) -> StoreResult:
-        if record.source == "mastodon" and "emsc" in (record.source_id or ""):
-            logger.debug("Ignoring emsc mastodon item %s:%s", record.source, record.source_id)
-            return StoreResult.IGNORED
+    def _load_gazetteer(self, path: Optional[str]):
+        """
+        Builds an Aho-Corasick automaton over lowercased place names from a
+        UTF-8 file (one name per line). Returns None if not configured or if
+        pyahocorasick is not installed.
+        """
+        if not path:
+            return None
+        if ahocorasick is None:
+            logger.warning("LOC_GAZETTEER_PATH is set but pyahocorasick is not installed; gazetteer disabled")
+            return None
 
-        if not record.has_location():
-            logger.debug("No location data for %s:%s", record.source, record.source_id)
-            return StoreResult.NO_LOCATION
+        automaton = ahocorasick.Automaton()
+        count = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    name = line.strip()
+                    if not self._candidate_ok(name):
+                        continue
+                    key = name.lower()
+                    if key not in automaton:
+                        automaton.add_word(key, (len(key), name))
+                        count += 1
+        except OSError as e:
+            logger.error(f"Could not load gazetteer from {path}: {e}")
+            return None
 
-        if record.published_at is None:
-            logger.debug("Missing published_at for %s:%s", record.source, record.source_id)
-            return StoreResult.MISSING_PUBLISHED_AT
+        if not count:
+            return None
+        automaton.make_automaton()
+        logger.info(f"Gazetteer loaded: {count} names from {path}")
+        return automaton
 
-        try:
-            collected_at_dt = _to_utc_from_epoch_seconds(record.collected_at)
-        except (ValueError, OSError, TypeError) as e:
-            logger.warning(
-                "Invalid collected_at for %s:%s (%r): %s",
-                record.source, record.source_id, record.collected_at, e
-            )
-            return StoreResult.INVALID_COLLECTED_AT
+    def _gazetteer_candidates(self, text: str) -> List[str]:
+        """Longest non-overlapping gazetteer matches on word boundaries, de-duplicated in order."""
+        if self._gazetteer is None:
+            return []
 
-        try:
-            published_at_dt = _parse_published_at(record.published_at)
-        except (ValueError, TypeError) as e:
-            logger.warning(
-                "Invalid published_at for %s:%s (%r): %s",
-                record.source, record.source_id, record.published_at, e
-            )
-            return StoreResult.INVALID_PUBLISHED_AT
-
-        if published_at_dt is None:
-            return StoreResult.MISSING_PUBLISHED_AT
-
-        item = self.NormalizedItem(
-            source=record.source,
-            source_id=record.source_id,
-            collected_at=collected_at_dt,
-            published_at=published_at_dt,
-            title=record.title,
-            text=record.text,
-            url=record.url,
-            location_name=record.location_name,
-            lat=record.lat,
-            lon=record.lon,
-            author=record.author,
-        )
+        lowered = text.lower()
+        # str.lower() can change length for a few non-ASCII characters; offsets
+        # would no longer line up with word boundaries, so skip those texts.
+        if len(lowered) != len(text):
+            return []
+
+        out: Dict[str, str] = {}
+        n = len(lowered)
+        for end, (key_len, name) in self._gazetteer.iter_long(lowered):
+            start = end - key_len + 1
+            if start > 0 and lowered[start - 1].isalnum():
+                continue
+            if end + 1 < n and lowered[end + 1].isalnum():
+                continue
+            out.setdefault(name.lower(), name)
+        return list(out.values())
 
+    def _extract_candidates(self, doc) -> List[str]:
+        """
+        Returns LOC/GPE entity strings from a spaCy doc, filtered for common junk
+        and de-duplicated case-insensitively (first occurrence wins, order kept).
+        """
+        loc_labels = self._loc_labels
+        candidate_ok = self._candidate_ok
+
+        raw = [e.text.strip() for e in doc.ents if e.label_ in loc_labels]
+        kept = [s for s in raw if candidate_ok(s)]
+
+        first_by_lower: Dict[str, str] = {}
+        for c in kept:
+            first_by_lower.setdefault(c.lower(), c)
+        return list(first_by_lower.values())
+
+    def _count_store_result(self, record: IngestionRecord, res: StoreResult) -> None:
+        if res == StoreResult.INSERTED:
+            self.stats["inserted"] += 1
+        elif res == StoreResult.DUPLICATE:
+            # This can still happen due to races between workers or
+            # because another process inserted after our precheck.
+            self.stats["skipped_duplicates"] += 1
+        elif res == StoreResult.NO_LOCATION:
+            self.stats["no_location_data"] += 1
+        elif res == StoreResult.MISSING_PUBLISHED_AT:
+            self.stats["missing_published_at"] += 1
+        elif res == StoreResult.INVALID_COLLECTED_AT:
+            logger.info("ERROR for record %s", record)
+            logger.info("INVALID COLLECTED AT: %r", record.collected_at)
+            self.stats["parsing_error"] += 1
+        elif res == StoreResult.INVALID_PUBLISHED_AT:
+            logger.info("ERROR for record %s", record)
+            logger.info("INVALID PUBLISHED AT: %r", record.published_at)
+            self.stats["parsing_error"] += 1
+        elif res == StoreResult.IGNORED:
+            self.stats["ignored"] += 1
+        else:
+            self.stats["unknown_error"] += 1
+
+    def _store_rows(self, rows: List[Dict[str, Any]], records: List[IngestionRecord]) -> None:
+        """
+        Inserts all rows in one statement/transaction. If the bulk insert fails
+        (e.g. a single poison row), falls back to per-row savepoints inside one
+        transaction so one bad record cannot drop the whole batch.
+        """
         try:
-            item.set_media_urls(record.media_urls)
-            item.set_entities(record.entities)
-        except (TypeError, ValueError) as e:
-            logger.warning("JSON serialization error for %s:%s: %s", record.source, record.source_id, e)
-            item.media_urls = None
-            item.entities = None
-
-        # Prefer Postgres upsert "DO NOTHING" to avoid duplicate exceptions entirely.
-        # This requires Postgres (you have it) and Peewee's on_conflict support.
-        data = item.__data__.copy()
-        pk_name = item._meta.primary_key.name
-        data.pop(pk_name, None)
+            with database.atomic():
+                inserted = self._insert_rows(rows)
+        except DatabaseError:
+            logger.exception("Bulk insert of %d rows failed; retrying row by row", len(rows))
+        else:
+            self.stats["inserted"] += inserted
+            self.stats["skipped_duplicates"] += len(rows) - inserted
+            return
 
+        # One outer transaction (single commit) with a savepoint per row, so a
+        # failing row only rolls back itself.
+        with database.atomic():
+            for row, record in zip(rows, records):
+                try:
+                    with database.atomic():  # savepoint
+                        res = self._insert_row(row)
+                except Exception:
+                    logger.exception("Error processing record %s:%s", record.source, record.source_id)
+                    self.stats["unknown_error"] += 1
+                    continue
+                self._count_store_result(record, res)
+
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """Bulk INSERT ... ON CONFLICT DO NOTHING; returns the number of rows actually inserted."""
+        NI = self.NormalizedItem
+        query = (NI
+            .insert_many(rows)
+            .on_conflict(conflict_target=[NI.source, NI.source_id], action="IGNORE")
+            .returning(NI.id))
+        return len(list(query.execute()))
+
+    def _insert_row(self, data: Dict[str, Any]) -> StoreResult:
+        # No existence SELECT: the unique (source, source_id) index decides, and
+        # ON CONFLICT DO NOTHING makes a duplicate return no PK instead of raising.
         try:
-            ins = (self.NormalizedItem
+            res = (self.NormalizedItem
                 .insert(**data)
                 .on_conflict(
                     conflict_target=[self.NormalizedItem.source, self.NormalizedItem.source_id],
                     action="IGNORE",
-                ))
-            res = ins.execute()
-            # Peewee returns inserted PK on success; on conflict IGNORE it returns None/0 depending on version.
+                )
+                .execute())
             return StoreResult.INSERTED if res else StoreResult.DUPLICATE
-
-        except (AttributeError, TypeError):
-            # Peewee version doesn’t support action="IGNORE" or on_conflict signature differs -> fallback.
-            pass
-        except IntegrityError:
-            return StoreResult.DUPLICATE
-        except psycopg2.errors.UniqueViolation:
-            return StoreResult.DUPLICATE
-        except DatabaseError:
-            logger.exception("Database error storing item %s:%s", record.source, record.source_id)
-            raise
-
-        # Fallback path (works everywhere): insert-first and catch duplicates.
-        try:
-            item.save(force_insert=True)
-            return StoreResult.INSERTED
         except IntegrityError:
             return StoreResult.DUPLICATE
         except psycopg2.errors.UniqueViolation:
             return StoreResult.DUPLICATE
         except DatabaseError:
-            logger.exception("Database error storing item %s:%s", record.source, record.source_id)
+            logger.exception("Database error storing item %s:%s", data.get("source"), data.get("source_id"))
             raise
 
     def get_stats(self) -> Dict[str, int]:
@@ -462,55 +754,95 @@ class EventsIngestionService:
             "location_ner_attempted": 0,
             "location_ner_found": 0,
             "location_resolved": 0,
+            "location_regex_resolved": 0,
+            "location_gazetteer_found": 0,
+            "location_ner_skipped": 0,
             "ignored":0,
             "parsing_error": 0,
         }
 
-    def read_from_memory_store(self) -> List[IngestionRecord]:
+    def read_from_memory_store(self) -> Iterator[IngestionRecord]:
+        """
+        Streams the raw_items queue from the memory store as NDJSON and yields
+        records one by one, so peak memory is bounded by the batch size rather
+        than by the queue length.
+        """
         try:
-            response = requests.get(f"{self.memory_store_url}/get/raw_items", timeout=10)
-            if response.status_code != 200:
-                logger.error(f"Failed to read from memory store: {response.status_code} - {response.text}")
-                return []
-
-            data = response.json()
-            raw_items = data.get("raw_items", [])
-            if not raw_items:
-                return []
-
-            records: List[IngestionRecord] = []
-            for item_data in raw_items:
-                try:
-                    records.append(IngestionRecord.from_dict(item_data))
-                except Exception as e:
-                    logger.warning(f"Failed to parse record from memory store: {e}")
-            return records
+            with requests.get(f"{self.memory_store_url}/stream/raw_items", stream=True, timeout=10) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to read from memory store: {response.status_code} - {response.text}")
+                    return
+
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    try:
+                        yield _decode_record(line)
+                    except Exception as e:
+                        logger.warning(f"Failed to parse record from memory store: {e}")
 
         except Exception as e:
             logger.error(f"Error reading from memory store: {e}")
-            return []
 
     def process_from_memory_store(self) -> Dict[str, int]:
-        records = self.read_from_memory_store()
-        if records:
-            return self.process_records(iter(records))
-        return self.stats.copy()
+        return self.process_records(self.read_from_memory_store())
 
     def run_continuous_processing(self, poll_interval: int = 5) -> None:
         logger.info(f"Starting continuous ingestion processing, polling every {poll_interval}s")
-        while True:
-            try:
-                stats = self.process_from_memory_store()
-                if stats.get("processed", 0) > 0:
-                    logger.info(f"Processed batch: {stats}")
-                time.sleep(poll_interval)
-            except KeyboardInterrupt:
-                logger.info("Shutdown signal received")
-                break
-            except Exception as e:
-                logger.error(f"Error in continuous processing loop: {e}")
-                traceback.print_exc()
-                time.sleep(poll_interval)
+        try:
+            asyncio.run(self._run_continuous_processing(poll_interval))
+        except KeyboardInterrupt:
+            logger.info("Shutdown signal received")
+        finally:
+            self.close()
+
+    async def _run_continuous_processing(self, poll_interval: int) -> None:
+        """
+        Overlaps fetching with processing: a producer reads batches from the
+        memory store while a consumer runs NER/DB work on the previous batch.
+        Both blocking sides run in their own single worker thread (spaCy and the
+        DB connection stay on one dedicated thread); the bounded queue keeps at
+        most a couple of batches in flight.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        fetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-fetch")
+        work_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-work")
+
+        async def produce() -> None:
+            while True:
+                try:
+                    batches = self._iter_batches(self.read_from_memory_store())
+                    fetched = 0
+                    while True:
+                        batch = await loop.run_in_executor(fetch_pool, next, batches, None)
+                        if batch is None:
+                            break
+                        fetched += len(batch)
+                        await queue.put(batch)
+                    if not fetched:
+                        await asyncio.sleep(poll_interval)
+                except Exception as e:
+                    logger.error(f"Error fetching from memory store: {e}")
+                    traceback.print_exc()
+                    await asyncio.sleep(poll_interval)
+
+        async def consume() -> None:
+            while True:
+                batch = await queue.get()
+                try:
+                    await loop.run_in_executor(work_pool, self._process_batch, batch)
+                except Exception as e:
+                    logger.error(f"Error in continuous processing loop: {e}")
+                    traceback.print_exc()
+                finally:
+                    queue.task_done()
+
+        try:
+            await asyncio.gather(produce(), consume())
+        finally:
+            fetch_pool.shutdown(wait=False, cancel_futures=True)
+            work_pool.shutdown(wait=False, cancel_futures=True)
 
 
 def start_continuous_ingestion():
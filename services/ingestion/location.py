@@ -2,14 +2,22 @@
 import os
 import re
 import math
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
-from typing import List, Optional, Tuple, Dict, Any, Set
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Optional, Tuple, Dict, Any, Set, FrozenSet
 
 logger = logging.getLogger(__name__)
 
 _WORD_RE = re.compile(r"[A-Za-z0-9]+")
 _FLOAT_RE = re.compile(r"[-+]?\d+(?:\.\d+)?")
+# ASCII punctuation/whitespace -> space, so ASCII text tokenizes via translate + split
+_NON_ALNUM_TABLE = str.maketrans({c: " " for c in map(chr, range(128)) if not c.isalnum()})
 
 # Minimal, high-signal country aliases (extend as needed)
 _COUNTRY_ALIASES: Dict[str, str] = {
@@ -34,10 +42,18 @@ _FEATURE_INTENT: Dict[str, Tuple[Set[str], Set[str]]] = {
     "country": ({"A"}, {"PCL"}),              # PCL* family (PCLI, PCL, etc.)
 }
 
-def _tokens(s: str) -> List[str]:
-    return [t.lower() for t in _WORD_RE.findall(s or "")]
+# Place names recur heavily across queries and candidates, so the pure string
+# helpers below are memoized. Cached values are immutable (tuple/frozenset).
 
-def _norm_join(tokens: List[str]) -> str:
+@lru_cache(maxsize=8192)
+def _tokens(s: str) -> Tuple[str, ...]:
+    if not s:
+        return ()
+    if s.isascii():
+        return tuple(s.lower().translate(_NON_ALNUM_TABLE).split())
+    return tuple(t.lower() for t in _WORD_RE.findall(s))
+
+def _norm_join(tokens: Tuple[str, ...]) -> str:
     return "".join(tokens)
 
 def _safe_float(x: Any) -> Optional[float]:
@@ -50,17 +66,29 @@ def _safe_float(x: Any) -> Optional[float]:
         return None
     if isinstance(x, (int, float)):
         return float(x)
-    m = _FLOAT_RE.search(str(x))
+    return _parse_float_str(str(x))
+
+@lru_cache(maxsize=8192)
+def _parse_float_str(s: str) -> Optional[float]:
+    # Well-formed numbers go straight through float() (C strtod); only junk
+    # like "8.0JS:8" needs the regex scan.
+    try:
+        v = float(s)
+    except ValueError:
+        v = None
+    if v is not None and math.isfinite(v):
+        return v
+    m = _FLOAT_RE.search(s)
     return float(m.group(0)) if m else None
 
-def _log_pop(pop: int) -> float:
-    if pop <= 0:
-        return 0.0
-    return math.log10(pop + 1)
+@lru_cache(maxsize=8192)
+def _normalize_name(name: Optional[str]) -> Tuple[str, FrozenSet[str]]:
+    """Stripped, lowercased name plus its token set; compute once per query/candidate."""
+    n = (name or "").strip().lower()
+    return n, frozenset(_tokens(n))
 
-def _name_match_score(query: str, cand_name: str) -> float:
-    q = (query or "").strip().lower()
-    n = (cand_name or "").strip().lower()
+def _name_match_score(q: str, qt: FrozenSet[str], n: str, nt: FrozenSet[str]) -> float:
+    """Scores a candidate name against the query; all inputs pre-normalized via _normalize_name."""
     if not q or not n:
         return 0.0
 
@@ -69,15 +97,14 @@ def _name_match_score(query: str, cand_name: str) -> float:
     if n.startswith(q):
         return 3.0
 
-    qt = set(_tokens(q))
-    nt = set(_tokens(n))
     if not qt:
         return 0.0
 
     overlap = len(qt & nt) / len(qt)
     return 2.0 * overlap
 
-def _detect_country_bias(tokens: List[str]) -> Optional[str]:
+@lru_cache(maxsize=4096)
+def _detect_country_bias(tokens: Tuple[str, ...]) -> Optional[str]:
     joined = _norm_join(tokens)
     if joined in _COUNTRY_ALIASES:
         return _COUNTRY_ALIASES[joined]
@@ -90,33 +117,57 @@ def _detect_country_bias(tokens: List[str]) -> Optional[str]:
 
     return None
 
-def _detect_feature_intent(tokens: List[str]) -> Tuple[Optional[Set[str]], Optional[Set[str]]]:
+def _detect_feature_intent(tokens: Tuple[str, ...]) -> Tuple[Optional[Set[str]], Optional[Set[str]]]:
     for t in tokens:
         if t in _FEATURE_INTENT:
             cls, prefixes = _FEATURE_INTENT[t]
             return (set(cls) if cls else None, set(prefixes) if prefixes else None)
     return (None, None)
 
-def _feature_score(feature_class: str, feature_code: str,
-                   want_classes: Optional[Set[str]],
-                   want_prefixes: Optional[Set[str]]) -> float:
-    fc = (feature_class or "").upper()
-    fcode = (feature_code or "").upper()
-    score = 0.0
+def _score_candidates(query: str, candidates: List[Dict[str, Any]],
+                      country_bias: Optional[str],
+                      want_classes: Optional[Set[str]],
+                      want_prefixes: Optional[Set[str]]) -> np.ndarray:
+    """
+    Weighted score per candidate: name match, feature intent, country bias,
+    a weak population prior and country-entity bonuses.
+    Field arrays are built once; the numeric terms are NumPy mask arithmetic.
+    """
+    n = len(candidates)
+    fcs = np.array([(c.get("feature_class") or "").upper() for c in candidates], dtype=object)
+    fcodes = np.array([(c.get("feature_code") or "").upper() for c in candidates], dtype=str)
+    pops = np.array([int(c.get("population") or 0) for c in candidates], dtype=np.float64)
+
+    # Name matching is string work; keep it scalar but collect into one array.
+    q, qt = _normalize_name(query)
+    s = 3.0 * np.fromiter((_name_match_score(q, qt, *_normalize_name(c.get("name", ""))) for c in candidates),
+                          dtype=np.float64, count=n)
 
     if want_classes is not None:
-        score += 2.5 if fc in want_classes else -2.5
+        s += 3.0 * np.where(np.isin(fcs, list(want_classes)), 2.5, -2.5)
 
     if want_prefixes:
-        score += 2.0 if any(fcode.startswith(p) for p in want_prefixes) else -1.0
+        has_prefix = np.zeros(n, dtype=bool)
+        for p in want_prefixes:
+            has_prefix |= np.char.startswith(fcodes, p)
+        s += 3.0 * np.where(has_prefix, 2.0, -1.0)
 
-    return score
+    if country_bias:
+        ccs = np.array([(c.get("country_code") or c.get("country") or "").upper() for c in candidates],
+                       dtype=object)
+        s += 3.0 * np.where(ccs == country_bias, 2.5, -1.5)
 
-def _country_score(candidate: Dict[str, Any], country_bias: Optional[str]) -> float:
-    if not country_bias:
-        return 0.0
-    cc = (candidate.get("country_code") or candidate.get("country") or "").upper()
-    return 2.5 if cc == country_bias else -1.5
+    # weak population prior: log10(pop + 1) for pop > 0
+    s += 0.8 * np.where(pops > 0, np.log10(np.maximum(pops, 0) + 1), 0.0)
+
+    is_country = (fcs == "A") & np.char.startswith(fcodes, "PCL")
+    # Mild general preference for country entities (helps where name isn't exact).
+    s += np.where(is_country, 4.0, 0.0)
+    # If query explicitly says "country", strongly prefer PCL*
+    if want_prefixes and "PCL" in want_prefixes:
+        s += np.where(is_country, 6.0, 0.0)
+
+    return s
 
 def _is_country_candidate(c: Dict[str, Any]) -> bool:
     fc = (c.get("feature_class") or "").upper()
@@ -126,19 +177,19 @@ def _is_country_candidate(c: Dict[str, Any]) -> bool:
 def _has_valid_latlon(c: Dict[str, Any]) -> bool:
     return _safe_float(c.get("lat")) is not None and _safe_float(c.get("lon")) is not None
 
-def _pick_best_country_candidate(candidates: List[Dict[str, Any]], query_tokens: List[str]) -> Optional[Dict[str, Any]]:
+def _pick_best_country_candidate(candidates: List[Dict[str, Any]], query_tokens: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
     country_cands = [c for c in candidates if _is_country_candidate(c) and _has_valid_latlon(c)]
     if not country_cands:
         return None
 
-    qt = set(query_tokens)
+    q, qt = _normalize_name(" ".join(query_tokens))
 
     def key(c: Dict[str, Any]) -> Tuple[int, int, float]:
         pop = int(c.get("population") or 0)
-        nm = (c.get("name") or "").lower()
-        overlap = len(set(_tokens(nm)) & qt)  # "Bolivarian Republic of Venezuela" overlaps on "venezuela"
+        n, nt = _normalize_name(c.get("name"))
+        overlap = len(nt & qt)  # "Bolivarian Republic of Venezuela" overlaps on "venezuela"
         # slight preference for better name overlap, then population
-        return (overlap, pop, _name_match_score(" ".join(query_tokens), c.get("name", "")))
+        return (overlap, pop, _name_match_score(q, qt, n, nt))
 
     return max(country_cands, key=key)
 
@@ -150,7 +201,25 @@ class LocationGetter:
     def __init__(self, service_url: Optional[str] = None):
         self.service_url = service_url or os.getenv("LOCATION_SERVICE_URL", "http://location:8787")
         self._session = requests.Session()
+        # Larger keep-alive pool so bursts of lookups reuse connections instead of
+        # reconnecting; small retry budget for transient connection/5xx errors.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504)),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         self._timeout = 10  # seconds
+        # Hot place names are looked up over and over; keep the most recent
+        # results resident. Failed requests raise and are therefore not cached.
+        self._lookup = lru_cache(maxsize=20000)(self._query_location)
+        # Lookups are network-bound, so a batch is fanned out over a small pool
+        # (kept below the HTTP pool size so every worker gets a connection).
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("LOCATION_LOOKUP_WORKERS", "8")),
+            thread_name_prefix="location-lookup",
+        )
 
     def get_location(self, text: str) -> Optional[Tuple[float, float, float]]:
         result = self.parse_location(text)
@@ -163,6 +232,22 @@ class LocationGetter:
             return None
 
         query = text.strip()
+        try:
+            return self._lookup(query)
+        except Exception as e:
+            logger.error(f"Error querying location service for '{text}': {e}")
+            return None
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        info = self._lookup.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+
+    def _query_location(self, query: str) -> Optional[Tuple[str, float, float, float, float]]:
         toks = _tokens(query)
         if not toks:
             return None
@@ -170,85 +255,61 @@ class LocationGetter:
         country_bias = _detect_country_bias(toks)
         want_classes, want_prefixes = _detect_feature_intent(toks)
 
-        try:
-            params = {"key": query, "limit": 50}
-            response = self._session.get(f"{self.service_url}/query", params=params, timeout=self._timeout)
-            response.raise_for_status()
-
-            data = response.json()
-            candidates: List[Dict[str, Any]] = data.get("candidates", [])
-            if not candidates:
-                return None
-
-            # NEW PREFERENCE:
-            # For single-token queries with no explicit feature intent,
-            # prefer a country-level entity (A.PCL*) over places with the exact same name.
-            # This fixes cases like "Venezuela" returning a town named Venezuela.
-            if len(toks) == 1 and want_classes is None and want_prefixes is None:
-                best_country = _pick_best_country_candidate(candidates, toks)
-                if best_country is not None:
-                    name = best_country.get("name", "")
-                    lat = _safe_float(best_country.get("lat"))
-                    lon = _safe_float(best_country.get("lon"))
-                    if lat is not None and lon is not None:
-                        return (name, float(lat), float(lon), 0.5, 10.0)
-
-            # Otherwise, compute a weighted score.
-            best: Optional[Dict[str, Any]] = None
-            best_score = -1e9
-
-            for c in candidates:
-                name = c.get("name", "")
-                lat = _safe_float(c.get("lat"))
-                lon = _safe_float(c.get("lon"))
-                if lat is None or lon is None:
-                    continue
-
-                fc = c.get("feature_class", "")
-                fcode = c.get("feature_code", "")
-                pop = int(c.get("population") or 0)
-
-                s = 0.0
-                s += _name_match_score(query, name) * 3.0
-                s += _feature_score(fc, fcode, want_classes, want_prefixes) * 3.0
-                s += _country_score(c, country_bias) * 3.0
-                s += _log_pop(pop) * 0.8  # weak prior
-
-                # Mild general preference for country entities (helps where name isn't exact).
-                if _is_country_candidate(c):
-                    s += 4.0
-
-                # If query explicitly says "country", strongly prefer PCL*
-                if want_prefixes and any(p == "PCL" for p in want_prefixes) and _is_country_candidate(c):
-                    s += 6.0
-
-                if s > best_score:
-                    best_score = s
-                    best = c
-
-            if not best:
-                return None
-
-            name = best.get("name", "")
-            lat = _safe_float(best.get("lat"))
-            lon = _safe_float(best.get("lon"))
-            if lat is None or lon is None:
-                return None
-
-            fc = (best.get("feature_class") or "").upper()
-            if fc == "P":
-                area = 0.1
-            elif fc == "A":
-                area = 0.5
-            else:
-                area = 0.2
-
-            score = max(1.0, min(10.0, 1.0 + best_score / 5.0))
-            return (name, float(lat), float(lon), area, score)
+        params = {"key": query, "limit": 50}
+        response = self._session.get(f"{self.service_url}/query", params=params, timeout=self._timeout)
+        response.raise_for_status()
 
-        except Exception as e:
-            logger.error(f"Error querying location service for '{text}': {e}")
+        data = response.json()
+        candidates: List[Dict[str, Any]] = data.get("candidates", [])
+        if not candidates:
+            return None
+
+        # NEW PREFERENCE:
+        # For single-token queries with no explicit feature intent,
+        # prefer a country-level entity (A.PCL*) over places with the exact same name.
+        # This fixes cases like "Venezuela" returning a town named Venezuela.
+        if len(toks) == 1 and want_classes is None and want_prefixes is None:
+            best_country = _pick_best_country_candidate(candidates, toks)
+            if best_country is not None:
+                name = best_country.get("name", "")
+                lat = _safe_float(best_country.get("lat"))
+                lon = _safe_float(best_country.get("lon"))
+                if lat is not None and lon is not None:
+                    return (name, float(lat), float(lon), 0.5, 10.0)
+
+        # Otherwise, compute a weighted score over all candidates with usable coordinates.
+        scorable = [c for c in candidates if _has_valid_latlon(c)]
+        if not scorable:
+            return None
+
+        scores = _score_candidates(query, scorable, country_bias, want_classes, want_prefixes)
+        best_idx = int(np.argmax(scores))  # first max wins, like the old strict '>' loop
+        best = scorable[best_idx]
+        best_score = float(scores[best_idx])
+
+        name = best.get("name", "")
+        lat = _safe_float(best.get("lat"))
+        lon = _safe_float(best.get("lon"))
+        if lat is None or lon is None:
             return None
 
+        fc = (best.get("feature_class") or "").upper()
+        if fc == "P":
+            area = 0.1
+        elif fc == "A":
+            area = 0.5
+        else:
+            area = 0.2
+
+        score = max(1.0, min(10.0, 1.0 + best_score / 5.0))
+        return (name, float(lat), float(lon), area, score)
+
     def parse_locations_batch(self, texts: List[str], batch_size: int = 50) -> List[Optional[Tuple]]:
-        return [self.parse_location(t) for t in texts]
\ No newline at end of file
+        if len(texts) <= 1:
+            return [self.parse_location(t) for t in texts]
+        return list(self._executor.map(self.parse_location, texts))
+
+    async def parse_locations_batch_async(self, texts: List[str]) -> List[Optional[Tuple]]:
+        loop = asyncio.get_running_loop()
+        tasks = [loop.run_in_executor(self._executor, self.parse_location, t) for t in texts]
+        return list(await asyncio.gather(*tasks))
\ No newline at end of file
@@ -0,0 +1,44 @@
+# test_coordinates.py
+#
+# _extract_coordinates: explicitly marked lat/lon pairs in text resolve
+# directly; bare decimal pairs (prices, magnitudes, depths) must not.
+#
+# Requirements:
+# - The ingestion service's dependencies (spaCy, psycopg2, ...) installed,
+#   since the module imports them at load time.
+#
+# Run:
+#   pytest -q services/ingestion/tests/
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("spacy")
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(_HERE), os.path.abspath(os.path.join(_HERE, "..", "..", ".."))]
+
+from ingestion import _extract_coordinates  # noqa: E402
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Quake near 45.5°N 13.7°E this morning", (45.5, 13.7)),
+    ("Epicentre 36.12 N, 97.07 W", (36.12, -97.07)),
+    ("Fire reported at 33.9° S, 151.2° E", (-33.9, 151.2)),
+    ("lat: 36.12, lon: -97.07", (36.12, -97.07)),
+])
+def test_marked_pairs_resolve(text, expected):
+    assert _extract_coordinates(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Shares fell 3.25, 4.10 at the close",
+    "M 5.4, 10.0 km depth",
+    "Quake at 36.12, -97.07",
+])
+def test_plain_number_pairs_are_ignored(text):
+    assert _extract_coordinates(text) is None
@@ -1,16 +1,34 @@
 """Memory Store Service - Temporary queue for raw items from scrapers"""
 import asyncio
 import os
+from collections import deque
 from aiohttp import web
-import json
+import msgpack
+import orjson
 
 headers = {'Access-Control-Allow-Origin': '*'}
 
+
+def _resp(obj, status=200):
+    """JSON response encoded with orjson (much faster than aiohttp's stdlib json)"""
+    return _resp_bytes(orjson.dumps(obj), status=status)
+
+
+def _resp_bytes(body, status=200):
+    return web.Response(body=body, status=status, content_type='application/json', headers=headers)
+
+# Items per write() when streaming a queue as NDJSON
+STREAM_CHUNK_ITEMS = 200
+
+# Scrapers are refused (429) once this many raw items are waiting, so a stalled
+# ingestion service cannot grow the queue until the process runs out of memory
+RAW_ITEMS_HIGH_WATER = int(os.getenv('RAW_ITEMS_HIGH_WATER', '1000000'))
+
 class MemoryServer:
     def __init__(self, address="0.0.0.0", port=6379):
         # Raw items queue - consumed on read by ingestion service
         # Scrapers push raw unprocessed data here
-        self.raw_items = []
+        self.raw_items = deque()
         
         # Cluster queue - consumed on read by clustering service
         # Ingestion service pushes items here for clustering
@@ -27,81 +45,122 @@ class MemoryServer:
             "home_latest_timeline": True
         }
         self.search_queries = ["breaking"]
+        # Config is read far more often than it changes; keep the encoded GET bodies
+        self._encode_tweet_sources()
+        self._encode_search_queries()
         
         self.address = address
         self.port = port
         self.runner = None
         self.site = None
 
+    def _encode_tweet_sources(self):
+        self._tweet_sources_enc = orjson.dumps({"tweet_sources": self.tweet_sources})
+
+    def _encode_search_queries(self):
+        self._search_queries_enc = orjson.dumps({"search_queries": self.search_queries})
+
     async def handle_get(self, request):
         key = request.match_info.get('key')
         
         # Raw items queue - consumed on read by ingestion service
         if key == 'raw_items':
-            value = self.raw_items
-            self.raw_items = []  # Consume the queue
-            return web.json_response({"raw_items": value}, headers=headers)
+            value = list(self.raw_items)
+            self.raw_items.clear()  # Consume the queue
+            return _resp({"raw_items": value})
         
         # Persistent configuration stores (NOT consumed on read)
         if key == 'tweet_sources':
-            return web.json_response({"tweet_sources": self.tweet_sources}, headers=headers)
+            return _resp_bytes(self._tweet_sources_enc)
         
         if key == 'search_queries':
-            return web.json_response({"search_queries": self.search_queries}, headers=headers)
+            return _resp_bytes(self._search_queries_enc)
         
         # Health check
         if key == 'health':
-            return web.json_response({
+            return _resp({
                 "status": "healthy", 
                 "raw_items_queue_size": len(self.raw_items)
-            }, headers=headers)
+            })
         
         return web.Response(status=404, text="Key not found", headers=headers)
 
+    async def handle_stream(self, request):
+        key = request.match_info.get('key')
+
+        # Raw items queue streamed as NDJSON (one item per line), consumed on read.
+        # Lets the ingestion service parse records incrementally instead of
+        # holding the whole queue (and its parsed copy) in memory at once.
+        if key == 'raw_items':
+            value = list(self.raw_items)
+            self.raw_items.clear()  # Consume the queue
+
+            response = web.StreamResponse(headers={**headers, 'Content-Type': 'application/x-ndjson'})
+            await response.prepare(request)
+            for start in range(0, len(value), STREAM_CHUNK_ITEMS):
+                chunk = value[start:start + STREAM_CHUNK_ITEMS]
+                await response.write(b''.join(orjson.dumps(item) + b'\n' for item in chunk))
+            await response.write_eof()
+            return response
+
+        return web.Response(status=404, text="Key not found", headers=headers)
+
     async def handle_post(self, request):
-        value_dict = await request.json()
+        body = await request.read()
+        # Supervisor posts msgpack; the frontend and other clients post JSON
+        if request.content_type == 'application/msgpack':
+            value_dict = msgpack.unpackb(body, raw=False)
+        else:
+            value_dict = orjson.loads(body)
         key, value = value_dict.get("key"), value_dict.get("value")
         
         # Raw items queue - scrapers push unprocessed data here
         if key == "raw_items":
-            added = 0
-            for item in value:
-                self.raw_items.append(item)
-                added += 1
-            return web.json_response({
+            if len(self.raw_items) >= RAW_ITEMS_HIGH_WATER:
+                return _resp({
+                    'status': 'error',
+                    'message': 'raw_items queue is full',
+                    'queue_size': len(self.raw_items)
+                }, status=429)
+            before = len(self.raw_items)
+            self.raw_items.extend(value)
+            added = len(self.raw_items) - before
+            return _resp({
                 'status': 'success', 
                 'added': added, 
                 'queue_size': len(self.raw_items)
-            }, headers=headers)
+            })
                 
         # Persistent configuration stores (NOT consumed on read)
         if key == "tweet_sources":
             if isinstance(value, dict):
                 self.tweet_sources = value
-                return web.json_response({
+                self._encode_tweet_sources()
+                return _resp({
                     'status': 'success',
                     'tweet_sources': self.tweet_sources
-                }, headers=headers)
+                })
             else:
-                return web.json_response({
+                return _resp({
                     'status': 'error',
                     'message': 'tweet_sources must be a dictionary'
-                }, status=400, headers=headers)
+                }, status=400)
         
         if key == "search_queries":
             if isinstance(value, list):
                 self.search_queries = value
-                return web.json_response({
+                self._encode_search_queries()
+                return _resp({
                     'status': 'success',
                     'search_queries': self.search_queries
-                }, headers=headers)
+                })
             else:
-                return web.json_response({
+                return _resp({
                     'status': 'error',
                     'message': 'search_queries must be a list'
-                }, status=400, headers=headers)
+                }, status=400)
         
-        return web.json_response({'status': 'error', 'message': 'Unknown key'}, status=400, headers=headers)
+        return _resp({'status': 'error', 'message': 'Unknown key'}, status=400)
     
     async def handle_options(self, request):
         # Handle CORS preflight requests
@@ -119,6 +178,7 @@ class MemoryServer:
         print(f"Starting memory store server on http://{self.address}:{self.port}")
         app = web.Application(client_max_size=100000000)  # 100MB limit
         app.add_routes([web.get('/get/{key}', self.handle_get)])
+        app.add_routes([web.get('/stream/{key}', self.handle_stream)])
         app.add_routes([web.post('/post', self.handle_post)])
         app.add_routes([web.options('/post', self.handle_options)])
         self.runner = web.AppRunner(app)
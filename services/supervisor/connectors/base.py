@@ -53,6 +53,15 @@ class BaseConnector(abc.ABC):
         """
         pass
 
+    def close(self) -> None:
+        """
+        Release resources held between fetches (thread pools, sessions).
+
+        Called by the supervisor when the connector's loop ends; the default
+        holds nothing.
+        """
+        pass
+
     def create_record(
         self,
         source_id: str,
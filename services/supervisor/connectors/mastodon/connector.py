@@ -5,9 +5,12 @@ Provides open microblog stream for early chatter and hashtag monitoring.
 """
 
 import asyncio
+import html
 import json
+import re
 import time
 import aiohttp
+import orjson
 from typing import Iterator, Dict, Any, Optional, List
 from datetime import datetime
 from urllib.parse import urljoin
@@ -15,6 +18,11 @@ from urllib.parse import urljoin
 from ..base import BaseConnector
 from shared.models.models import IngestionRecord
 
+# Status HTML is a handful of simple tags (<p>, <br>, <a>, <span>); a tag-stripping
+# regex handles it without building a parse tree.
+_TAG_RE = re.compile(r'<[^<>]+>')
+_BR_RE = re.compile(r'<br\s*/?>|</p\s*>', re.I)
+
 
 class MastodonConnector(BaseConnector):
     """
@@ -64,7 +72,26 @@ class MastodonConnector(BaseConnector):
         self.poll_interval = config.get('poll_interval', 300)  # 5 minutes
         self.timeout = config.get('timeout', 10)  # seconds per instance
 
-    async def _fetch_instance_timeline(self, instance_url: str, stream_type: str = 'public:local') -> List[Dict[str, Any]]:
+        # Per-request settings, built once. Some instances reject clients
+        # without a User-Agent.
+        self._timeout = aiohttp.ClientTimeout(total=self.timeout)
+        self._headers = {
+            'User-Agent': config.get('user_agent', 'NewsGlobe/1.0'),
+            'Accept': 'application/json',
+        }
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """
+        Create the HTTP session shared by all requests of one poll cycle.
+
+        fetch() runs each poll on its own event loop and an aiohttp session is
+        bound to the loop it was created on, so the session lives for one cycle.
+        """
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=60)
+        return aiohttp.ClientSession(connector=connector, timeout=self._timeout, headers=self._headers)
+
+    async def _fetch_instance_timeline(self, session: aiohttp.ClientSession, instance_url: str,
+                                       stream_type: str = 'public:local') -> List[Dict[str, Any]]:
         """
         Fetch timeline from a single Mastodon instance.
 
@@ -82,15 +109,13 @@ class MastodonConnector(BaseConnector):
             else:
                 api_url = urljoin(instance_url, '/api/v1/timelines/public?limit=40')
 
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(api_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if isinstance(data, list):
-                            statuses = data
-                    else:
-                        self.logger.warning(f"HTTP {response.status} from {instance_url}")
+            async with session.get(api_url) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    if isinstance(data, list):
+                        statuses = data
+                else:
+                    self.logger.warning(f"HTTP {response.status} from {instance_url}")
 
         except Exception as e:
             self.logger.warning(f"Error fetching from {instance_url}: {e}")
@@ -99,32 +124,52 @@ class MastodonConnector(BaseConnector):
 
     def _extract_text_from_html(self, html_content: str) -> str:
         """Extract plain text from HTML content."""
+        if not html_content:
+            return html_content
+
+        # Fast path: line breaks/paragraph ends become spaces, other tags vanish
+        stripped = _TAG_RE.sub('', _BR_RE.sub(' ', html_content))
+        if '<' not in stripped and '>' not in stripped:
+            return ' '.join(html.unescape(stripped).split())
+
+        # Brackets left over (e.g. inside attribute values): use a real parser
         try:
             from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            return soup.get_text(separator=' ', strip=True)
-        except:
+        except ImportError:
             # Fallback: return as-is if BeautifulSoup not available
             return html_content
 
+        # lxml (C parser) first; pure-Python html.parser if lxml is missing
+        for parser in ('lxml', 'html.parser'):
+            try:
+                soup = BeautifulSoup(html_content, parser)
+                return soup.get_text(separator=' ', strip=True)
+            except Exception:
+                continue
+        return html_content
+
     def status_to_record(self, status: Dict[str, Any], instance: str, stream: str) -> IngestionRecord:
         """
         Convert Mastodon status to unified IngestionRecord format.
         """
-        status_id = status.get('id')
-        account = status.get('account')
-        created_at = status.get('created_at')
-        content = status.get('content')
-        url = status.get('url')
-        language = status.get('language')
-        reblog = status.get('reblog') is not None
+        sg = status.get
+        status_id = sg('id')
+        account = sg('account')
+        created_at = sg('created_at')
+        content = sg('content')
+        url = sg('url')
+        language = sg('language')
+        reblog = sg('reblog') is not None
 
         # Extract text from HTML
         text = self._extract_text_from_html(content)
 
         # Account info
-        acct = account.get('acct')
-        display_name = account.get('display_name')
+        if account:
+            acct = account.get('acct')
+            display_name = account.get('display_name')
+        else:
+            acct = display_name = None
 
         # Create title from account and preview of text
         title = text[:100]
@@ -149,53 +194,71 @@ class MastodonConnector(BaseConnector):
                 'account_display_name': display_name,
                 'language': language,
                 'reblog': reblog,
-                'replies_count': status.get('replies_count'),
-                'reblogs_count': status.get('reblogs_count'),
-                'favourites_count': status.get('favourites_count'),
+                'replies_count': sg('replies_count'),
+                'reblogs_count': sg('reblogs_count'),
+                'favourites_count': sg('favourites_count'),
             },
             raw=status,
         )
 
-    async def _fetch_all_timelines(self) -> List[IngestionRecord]:
-        """Fetch timelines from all configured instances and hashtags."""
+    def _statuses_to_records(self, statuses: List[Dict[str, Any]], instance: str, stream: str) -> List[IngestionRecord]:
+        """Convert one timeline's statuses; runs in a worker thread."""
         records = []
+        for status in statuses:
+            try:
+                records.append(self.status_to_record(status, instance, stream))
+            except Exception as e:
+                self.logger.warning(f"Error converting status from {instance}: {e}")
+        return records
 
-        # Build list of (instance, stream_type) pairs to fetch
-        fetches = []
-
-        for instance in self.instances:
-            # Public local timeline
-            fetches.append((instance, 'public:local'))
+    async def _fetch_and_convert(self, session: aiohttp.ClientSession, instance: str, stream: str) -> List[IngestionRecord]:
+        """
+        Fetch one timeline and convert it off the event loop, so HTML stripping
+        overlaps with the requests that are still in flight.
+        """
+        statuses = await self._fetch_instance_timeline(session, instance, stream)
+        if not statuses:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._statuses_to_records, statuses, instance, stream)
+
+    async def _fetch_instance_all(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                  instance: str, streams: List[str]) -> List[IngestionRecord]:
+        """
+        Fetch all streams of one instance one after another, so they reuse a
+        single keep-alive connection instead of opening one per stream.
+        """
+        records = []
+        async with semaphore:
+            for stream in streams:
+                try:
+                    records.extend(await self._fetch_and_convert(session, instance, stream))
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch {instance} {stream}: {e}")
+        return records
 
-            # Hashtag timelines
-            for hashtag in self.hashtags:
-                fetches.append((instance, f'tag:{hashtag}'))
+    async def _fetch_all_timelines(self) -> List[IngestionRecord]:
+        """Fetch timelines from all configured instances and hashtags."""
+        records = []
 
-        # Fetch all concurrently
-        tasks = []
-        for instance, stream in fetches:
-            task = self._fetch_instance_timeline(instance, stream)
-            tasks.append((instance, stream, task))
+        # Streams to fetch per instance: public local timeline, then hashtags
+        streams = ['public:local'] + [f'tag:{hashtag}' for hashtag in self.hashtags]
 
-        # Run all tasks concurrently
-        results = await asyncio.gather(
-            *[task for _, _, task in tasks],
-            return_exceptions=True
-        )
+        # Instances run concurrently (capped), streams within an instance in
+        # sequence, all over one session (keep-alive, shared DNS cache)
+        semaphore = asyncio.Semaphore(16)
+        async with self._create_session() as session:
+            results = await asyncio.gather(
+                *[self._fetch_instance_all(session, semaphore, instance, streams) for instance in self.instances],
+                return_exceptions=True
+            )
 
-        # Process results
-        for (instance, stream, _), result in zip(tasks, results):
+        # Collect results
+        for instance, result in zip(self.instances, results):
             if isinstance(result, Exception):
-                self.logger.warning(f"Failed to fetch {instance} {stream}: {result}")
+                self.logger.warning(f"Failed to fetch {instance}: {result}")
                 continue
-
-            statuses = result
-            for status in statuses:
-                try:
-                    record = self.status_to_record(status, instance, stream)
-                    records.append(record)
-                except Exception as e:
-                    self.logger.warning(f"Error converting status from {instance}: {e}")
+            records.extend(result)
 
         return records
 
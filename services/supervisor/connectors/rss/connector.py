@@ -2,7 +2,8 @@
 RSS connector for news feeds aggregation.
 
 Fetches articles from configured RSS feeds and converts them to unified format.
-Multithreaded with 8 workers (feed fetch + item->record conversion).
+Feed downloads run on a wide I/O pool (fetch_workers, default 32); item->record
+conversion runs on 8 workers.
 
 Safety timeout mechanism:
 - Per-feed HTTP connect/read timeouts (requests), so a single slow/broken feed cannot hang a worker indefinitely.
@@ -10,24 +11,58 @@ Safety timeout mechanism:
 - Optional global fetch() deadline; cancels pending work and returns what is ready.
 """
 
+import html
 import json
 import os
 import time
 import threading
-from typing import Iterator, Dict, Any, Optional, List, Tuple
+from collections import OrderedDict
+from typing import Iterator, Dict, Any, Optional, List, Set, Tuple
 from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import logging
 
 import feedparser
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from lxml import etree
+from lxml import html as lxml_html
 
 from ..base import BaseConnector
 from shared.models.models import IngestionRecord, validate_record
 
 logger = logging.getLogger(__name__)
 
+# One lxml parser per worker thread (parsers are not safe to share across threads)
+_tls = threading.local()
+
+
+def _html_parser() -> lxml_html.HTMLParser:
+    parser = getattr(_tls, "parser", None)
+    if parser is None:
+        parser = _tls.parser = lxml_html.HTMLParser(recover=True, no_network=True)
+    return parser
+
+
+def _fmt_iso(st) -> str:
+    """time.strftime(RSSConnector.TIME_FORMAT, st) without the generic format machinery."""
+    return f"{st[0]:04d}-{st[1]:02d}-{st[2]:02d}T{st[3]:02d}:{st[4]:02d}:{st[5]:02d}Z"
+
+
+def _strip_html(s: str) -> str:
+    """Plain text of an HTML fragment; plain-text input skips the parser entirely."""
+    if "<" not in s:
+        return html.unescape(s) if "&" in s else s
+    try:
+        frag = lxml_html.fragment_fromstring(s, create_parent="div", parser=_html_parser())
+    except (etree.ParserError, ValueError):
+        return s
+    # feedparser's sanitizer is off, so drop script/style bodies here
+    for el in frag.xpath(".//script|.//style"):
+        el.drop_tree()
+    # str(): the lxml smart string would keep the whole parsed fragment alive
+    return str(frag.text_content())
+
 
 class RSSConnector(BaseConnector):
     """
@@ -38,6 +73,9 @@ class RSSConnector(BaseConnector):
 
     TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 
+    # Articles converted per Stage B task; per-record futures cost about as much as the work
+    RECORD_CHUNK = 64
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__("rss", config)
 
@@ -47,6 +85,10 @@ class RSSConnector(BaseConnector):
         # Force 8 workers as requested
         self.max_workers = 8
 
+        # Feed downloads mostly wait on sockets (GIL released), so they get a
+        # wider pool of their own instead of queueing behind the 8 workers.
+        self.fetch_workers = int(config.get("fetch_workers", 32))
+
         # Optional: keep delay for politeness; applied per-host across threads.
         self.request_delay = float(config.get("request_delay", 1.0))
 
@@ -75,12 +117,35 @@ class RSSConnector(BaseConnector):
             "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         )
 
+        # Pools live as long as the connector so polls reuse warm threads
+        self._fetch_executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="rss-fetch-")
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rss-")
+
+        # URLs whose records were already yielded -> when (monotonic), oldest
+        # first. Feeds overlap and re-list recent items every poll; those are
+        # skipped before Stage B. Entries expire after seen_urls_ttl_s, so an
+        # item the supervisor failed to deliver is sent again on a later poll
+        # that still lists it (until then its loss is accepted).
+        self.seen_urls_max = int(config.get("seen_urls_max", 100_000))
+        self.seen_urls_ttl_s = float(config.get("seen_urls_ttl_s", 6 * 3600))
+        self._seen_urls: "OrderedDict[str, float]" = OrderedDict()
+
+        # Conditional GET validators per feed: url -> (etag, last_modified).
+        # Unchanged feeds then answer 304 with no body. Stored only once the
+        # feed's articles have been yielded, so an unfinished poll refetches it.
+        self._feed_meta: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
         # Per-host rate limiting state (to avoid 8 threads sleeping independently).
         self._host_lock = threading.Lock()
         self._host_next_allowed: Dict[str, float] = {}
 
-        # Requests session for connection reuse
+        # Requests session for connection reuse. The feed list spans dozens of
+        # hosts; keep a pool per host (default is only 10) so keep-alive
+        # connections survive between polls instead of being evicted.
         self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=128, pool_maxsize=self.fetch_workers)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
         self._http.headers.update(
             {
                 "User-Agent": feedparser.USER_AGENT,
@@ -125,22 +190,37 @@ class RSSConnector(BaseConnector):
         if wait_s > 0:
             time.sleep(wait_s)
 
-    def _http_get_feed(self, feed_url: str) -> Tuple[Optional[bytes], Optional[int], Optional[str]]:
+    def _http_get_feed(
+        self, feed_url: str
+    ) -> Tuple[Optional[bytes], Optional[int], Optional[str], Optional[str], Optional[Tuple[Optional[str], Optional[str]]]]:
         """
         Fetch raw feed bytes with hard timeouts.
-        Returns (content_bytes, status_code, final_url).
+        Returns (content_bytes, status_code, final_url, content_type, validators); status
+        304 means unchanged since last poll. validators is the response's
+        (etag, last_modified), or None; the caller stores it in _feed_meta.
         """
+        headers = {}
+        etag, last_modified = self._feed_meta.get(feed_url, (None, None))
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
         try:
             resp = self._http.get(
                 feed_url,
+                headers=headers,
                 timeout=(self.http_connect_timeout_s, self.http_read_timeout_s),
                 allow_redirects=True,
             )
             status = resp.status_code
             final_url = resp.url
             if status != 200:
-                return None, status, final_url
-            return resp.content, status, final_url
+                return None, status, final_url, None, None
+
+            etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+            validators = (etag, last_modified) if etag or last_modified else None
+            return resp.content, status, final_url, resp.headers.get("Content-Type"), validators
         except requests.Timeout:
             self.logger.warning(
                 "Timeout fetching feed %s (connect=%.1fs read=%.1fs)",
@@ -148,16 +228,21 @@ class RSSConnector(BaseConnector):
                 self.http_connect_timeout_s,
                 self.http_read_timeout_s,
             )
-            return None, None, None
+            return None, None, None, None, None
         except requests.RequestException as e:
             self.logger.warning("HTTP error fetching feed %s: %s", feed_url, e)
-            return None, None, None
+            return None, None, None, None, None
 
-    def _fetch_single_feed(self, feed_url: str) -> List[Dict[str, Any]]:
+    def _fetch_single_feed(
+        self, feed_url: str
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Optional[str], Optional[str]]]]:
         """
         Fetch articles from a single RSS feed with safety timeouts.
+        Returns (articles, validators); validators are only returned with a
+        successfully parsed feed.
         """
         articles: List[Dict[str, Any]] = []
+        validators = None
         self.logger.info("Fetching articles from %s", feed_url)
 
         start = time.monotonic()
@@ -167,7 +252,11 @@ class RSSConnector(BaseConnector):
             self._throttle_host(feed_url)
 
             # Network stage (hard timeout via requests)
-            content, status, final_url = self._http_get_feed(feed_url)
+            content, status, final_url, content_type, new_validators = self._http_get_feed(feed_url)
+
+            if status == 304:
+                self.logger.debug("Feed %s not modified since last fetch", feed_url)
+                return articles, None
 
             if status is not None and status != 200:
                 if status == 301:
@@ -176,61 +265,82 @@ class RSSConnector(BaseConnector):
                     self.logger.warning("Feed %s returned status %s", feed_url, status)
 
             if not content:
-                return articles
+                return articles, None
 
             # Best-effort wall-clock guard before parsing (cannot preempt parser mid-run)
             if deadline is not None and time.monotonic() > deadline:
                 self.logger.warning("Feed %s exceeded total timeout before parse", feed_url)
-                return articles
-
-            # Parse bytes (no network inside feedparser now)
-            feed = feedparser.parse(content)
+                return articles, None
+
+            # Parse bytes (no network inside feedparser now). Skip feedparser's own
+            # HTML sanitizing/URI rewriting: we only keep plain text (_strip_html).
+            # The response headers give feedparser the declared charset up front,
+            # so it does not have to sniff the encoding from the bytes.
+            response_headers = {"content-location": final_url or feed_url}
+            if content_type:
+                response_headers["content-type"] = content_type
+            feed = feedparser.parse(
+                content,
+                response_headers=response_headers,
+                sanitize_html=False,
+                resolve_relative_uris=False,
+            )
 
             # Best-effort wall-clock guard after parse
             if deadline is not None and time.monotonic() > deadline:
                 self.logger.warning("Feed %s exceeded total timeout during parse", feed_url)
-                return articles
+                return articles, None
+
+            entries = getattr(feed, "entries", None)
+            if entries:
+                # Some feeds carry unusable summaries; decided once per feed
+                strip_description = "worldaffairsjournal" in feed_url
 
-            if "items" in feed:
                 # Cap items to avoid a single feed creating huge fan-out
-                for item in feed["items"][: self.max_items_per_feed]:
-                    article = self._parse_feed_item(item, feed, feed_url)
+                for item in entries[: self.max_items_per_feed]:
+                    article = self._parse_feed_item(item, feed, feed_url, strip_description=strip_description)
                     if article:
                         articles.append(article)
 
             self.logger.debug("Fetched %d articles from %s", len(articles), feed_url)
+            validators = new_validators
 
         except Exception as e:
             self.logger.error("Error fetching feed %s: %s", feed_url, e)
+            articles = []
 
-        return articles
+        return articles, validators
 
-    def _parse_feed_item(self, item: Dict, feed: Dict, feed_url: str) -> Optional[Dict[str, Any]]:
+    def _parse_feed_item(
+        self, item: Dict, feed: Dict, feed_url: str, strip_description: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """Parse a single feed item into an article dictionary."""
         try:
-            published_at = None
-            if "published_parsed" in item and item["published_parsed"]:
-                published_at = time.strftime(self.TIME_FORMAT, item["published_parsed"])
-            if not published_at:
-                published_at = time.strftime(self.TIME_FORMAT, time.gmtime())
+            # Plain dict lookups: FeedParserDict.get goes through its key-alias
+            # __getitem__, and these are the canonical keys anyway.
+            get = dict.get
+            link = get(item, "link", "")
+            title = get(item, "title", "")
+            if not link or not title:
+                return None
 
-            title = item.get("title", "")
-            title = BeautifulSoup(title, "lxml").get_text() if title else ""
+            title = _strip_html(title)
+            if not title:
+                return None
 
-            description = item.get("summary", "")
-            description = BeautifulSoup(description, "lxml").get_text() if description else ""
+            published_parsed = get(item, "published_parsed")
+            published_at = _fmt_iso(published_parsed if published_parsed else time.gmtime())
 
-            if "worldaffairsjournal" in feed_url:
+            if strip_description:
                 description = ""
+            else:
+                description = get(item, "summary", "")
+                description = _strip_html(description) if description else ""
 
             author = feed.get("channel", {}).get("title", "Unknown")
             if hasattr(feed, "feed") and "title" in feed.feed:
                 author = feed.feed.title
 
-            link = item.get("link", "")
-            if not link or not title:
-                return None
-
             return {
                 "author": author,
                 "title": title,
@@ -278,11 +388,52 @@ class RSSConnector(BaseConnector):
             self.logger.error("Error converting article to record: %s", e)
             return None
 
+    def _drop_seen_articles(self, articles: List[Dict[str, Any]], in_flight: Set[str]) -> List[Dict[str, Any]]:
+        """
+        Filter out articles whose URL was yielded within seen_urls_ttl_s, or is
+        already being converted in this fetch (in_flight, to which the new URLs
+        are added). Only called from the fetch() driving thread, so no lock is needed.
+        """
+        seen = self._seen_urls
+        cutoff = time.monotonic() - self.seen_urls_ttl_s
+        fresh = []
+        for article in articles:
+            url = article.get("url")
+            marked = seen.get(url)
+            if marked is not None and marked > cutoff:
+                continue
+            if url in in_flight:
+                continue
+            in_flight.add(url)
+            fresh.append(article)
+        return fresh
+
+    def _mark_seen(self, urls: List[str]) -> None:
+        """Remember URLs whose records were yielded, so later polls skip them."""
+        seen = self._seen_urls
+        now = time.monotonic()
+        for url in urls:
+            seen.pop(url, None)  # re-marked entries move to the newest end
+            seen[url] = now
+        cutoff = now - self.seen_urls_ttl_s
+        while seen and (len(seen) > self.seen_urls_max or next(iter(seen.values())) <= cutoff):
+            seen.popitem(last=False)
+
+    def _articles_to_valid_records(self, articles: List[Dict[str, Any]]) -> List[IngestionRecord]:
+        """Convert + validate a chunk of articles in one worker task."""
+        records = []
+        for article in articles:
+            record = self._article_to_valid_record(article)
+            if record is not None:
+                records.append(record)
+        return records
+
     def fetch(self) -> Iterator[IngestionRecord]:
         """
-        Multithreaded pipeline with 8 workers:
-        - Stage A: fetch feeds in parallel (fan-out)
-        - Stage B: convert+validate articles in parallel (fan-out)
+        Multithreaded pipeline:
+        - Stage A: fetch feeds in parallel on the I/O pool (fetch_workers)
+        - Stage B: convert+validate articles in parallel (8 workers, RECORD_CHUNK articles per task),
+          started per feed as soon as that feed is in, overlapping with Stage A
         Safety:
         - Optional global deadline; returns what is ready when exceeded.
         """
@@ -293,10 +444,10 @@ class RSSConnector(BaseConnector):
         if self.fetch_total_timeout_s and self.fetch_total_timeout_s > 0:
             global_deadline = time.monotonic() + self.fetch_total_timeout_s
 
-        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        fetch_executor = self._fetch_executor
+        executor = self._executor
         try:
-            feed_futures = {executor.submit(self._fetch_single_feed, url): url for url in self.feeds}
-            record_futures = set()
+            feed_futures = {fetch_executor.submit(self._fetch_single_feed, url): url for url in self.feeds}
 
             # Helper: remaining time for waits
             def _remaining() -> Optional[float]:
@@ -304,22 +455,31 @@ class RSSConnector(BaseConnector):
                     return None
                 return max(0.0, global_deadline - time.monotonic())
 
-            # Stage A: collect feeds with optional global timeout
+            # Stages A and B overlap: a finished feed fans out into record tasks
+            # right away, and finished record tasks are yielded while other feeds
+            # are still downloading.
+            produced = 0
             pending_feeds = set(feed_futures.keys())
-            while pending_feeds:
+            pending_records = {}  # record future -> (feed URL, URLs of its articles)
+            in_flight: Set[str] = set()
+            # feed URL -> [record tasks not yet yielded, validators], stored in
+            # _feed_meta once the count reaches zero
+            feed_progress: Dict[str, List[Any]] = {}
+            while pending_feeds or pending_records:
                 rem = _remaining()
                 if rem is not None and rem <= 0:
                     self.logger.warning(
-                        "Global fetch timeout reached (%.1fs); cancelling %d pending feed tasks",
+                        "Global fetch timeout reached (%.1fs); cancelling %d pending feed tasks and %d pending record tasks",
                         self.fetch_total_timeout_s,
                         len(pending_feeds),
+                        len(pending_records),
                     )
-                    for pf in pending_feeds:
+                    for pf in pending_feeds | pending_records.keys():
                         pf.cancel()
                     break
 
-                done, pending_feeds = wait(
-                    pending_feeds,
+                done, _ = wait(
+                    pending_feeds | pending_records.keys(),
                     timeout=rem if rem is not None else None,
                     return_when=FIRST_COMPLETED,
                 )
@@ -329,60 +489,61 @@ class RSSConnector(BaseConnector):
                     continue
 
                 for f in done:
-                    feed_url = feed_futures.get(f, "<unknown>")
-                    try:
-                        articles = f.result()
-                    except Exception as e:
-                        self.logger.error("Feed %s generated an exception: %s", feed_url, e)
+                    if f in pending_feeds:
+                        pending_feeds.discard(f)
+                        feed_url = feed_futures.get(f, "<unknown>")
+                        try:
+                            articles, validators = f.result()
+                        except Exception as e:
+                            self.logger.error("Feed %s generated an exception: %s", feed_url, e)
+                            continue
+
+                        articles = self._drop_seen_articles(articles, in_flight)
+                        for start in range(0, len(articles), self.RECORD_CHUNK):
+                            chunk = articles[start:start + self.RECORD_CHUNK]
+                            future = executor.submit(self._articles_to_valid_records, chunk)
+                            pending_records[future] = (feed_url, [article.get("url") for article in chunk])
+                        if validators is not None:
+                            if articles:
+                                feed_progress[feed_url] = [-(-len(articles) // self.RECORD_CHUNK), validators]
+                            else:
+                                self._feed_meta[feed_url] = validators
                         continue
 
-                    for article in articles:
-                        record_futures.add(executor.submit(self._article_to_valid_record, article))
-
-            # Stage B: yield records with optional global timeout
-            produced = 0
-            pending_records = set(record_futures)
-            while pending_records:
-                rem = _remaining()
-                if rem is not None and rem <= 0:
-                    self.logger.warning(
-                        "Global fetch timeout reached (%.1fs); cancelling %d pending record tasks",
-                        self.fetch_total_timeout_s,
-                        len(pending_records),
-                    )
-                    for pr in pending_records:
-                        pr.cancel()
-                    break
-
-                done, pending_records = wait(
-                    pending_records,
-                    timeout=rem if rem is not None else None,
-                    return_when=FIRST_COMPLETED,
-                )
-
-                if not done:
-                    continue
-
-                for rf in done:
+                    feed_url, urls = pending_records.pop(f)
                     try:
-                        rec = rf.result()
+                        recs = f.result()
                     except Exception as e:
                         self.logger.error("Record future exception: %s", e)
+                        feed_progress.pop(feed_url, None)  # refetch the whole feed next poll
                         continue
 
-                    if rec is not None:
-                        produced += 1
-                        yield rec
+                    produced += len(recs)
+                    yield from recs
+                    # Only now are these URLs done with; cancelled or failed
+                    # chunks are retried on the next poll
+                    self._mark_seen(urls)
+                    progress = feed_progress.get(feed_url)
+                    if progress is not None:
+                        progress[0] -= 1
+                        if not progress[0]:
+                            self._feed_meta[feed_url] = progress[1]
+                            del feed_progress[feed_url]
 
             self.logger.info(
-                "Successfully processed %d valid RSS records from %d feeds using %d threads",
+                "Successfully processed %d valid RSS records from %d feeds using %d fetch / %d worker threads",
                 produced,
                 len(self.feeds),
+                self.fetch_workers,
                 self.max_workers,
             )
 
         except Exception as e:
             self.logger.error("Error in RSS connector fetch: %s", e)
             raise
-        finally:
-            executor.shutdown(wait=True)
\ No newline at end of file
+
+    def close(self) -> None:
+        """Shut down the worker pools and the HTTP session without waiting on in-flight feeds."""
+        self._fetch_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
\ No newline at end of file
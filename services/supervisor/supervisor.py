@@ -10,22 +10,120 @@ Responsibilities:
 """
 
 import asyncio
+import concurrent.futures
+import itertools
 import logging
+import random
+import tempfile
 import time
-import json
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
-import requests
+import aiohttp
+import msgpack
+import orjson
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 from connectors import CONNECTORS
 from shared.models.models import IngestionRecord
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Connector output is pulled and queued this many records at a time
+FETCH_CHUNK = 100
+
+# Outgoing records are coalesced into one memory store POST per this many
+# records, or per this many seconds after the first one arrived
+OUT_BATCH_MAX = 500
+OUT_FLUSH_S = 0.25
+
+# Memory store POST retries: exponential backoff with full jitter
+SEND_MAX_RETRIES = 8
+SEND_BACKOFF_BASE_S = 1.0
+SEND_BACKOFF_CAP_S = 30.0
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Connector state: full snapshot plus an append-only log of per-connector
+# updates, folded back into the snapshot every STATE_COMPACT_EVERY saves
+STATE_FILE = "supervisor_state.json"
+STATE_WAL_FILE = "supervisor_state.wal"
+STATE_COMPACT_EVERY = 50
+# Changed connector state is written at most once per this many seconds
+STATE_SAVE_INTERVAL_S = 60.0
+
+# While the memory store circuit is open, encoded batches are spooled to disk
+# (POST bodies prefixed with 4-byte length and record count) and replayed
+# once it accepts writes again
+SPOOL_PATH = os.getenv('SUPERVISOR_SPOOL_PATH', 'supervisor_spool.bin')
+SPOOL_MAX_BYTES = int(os.getenv('SUPERVISOR_SPOOL_MAX_BYTES', str(64 * 1024 * 1024)))
+# A spooled batch that still fails (retryably) on this many replays, while live
+# batches get through, is moved to the dead-letter file so it stops blocking
+# the batches behind it
+SPOOL_MAX_REPLAYS = int(os.getenv('SUPERVISOR_SPOOL_MAX_REPLAYS', '5'))
+SPOOL_DEAD_PATH = os.getenv('SUPERVISOR_SPOOL_DEAD_PATH', 'supervisor_spool.dead')
+
+
+def _write_file_atomic(path: str, data: bytes) -> None:
+    # A unique temp file per write, so overlapping writes of one path never share it
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _spool_frames(data: bytes):
+    """Yield (end offset, record count, body) for each complete spool frame; a torn last frame is not yielded."""
+    pos = 0
+    while pos + 8 <= len(data):
+        size = int.from_bytes(data[pos:pos + 4], 'big')
+        end = pos + 8 + size
+        if end > len(data):
+            break
+        yield end, int.from_bytes(data[pos + 4:pos + 8], 'big'), data[pos + 8:end]
+        pos = end
+
+
+def _rewrite_spool(rest: bytes, dead: bytes = b'') -> None:
+    """
+    Append dead-lettered frames to SPOOL_DEAD_PATH, then replace the spool with
+    the frames still to be sent, or remove it if there are none.
+    """
+    if dead:
+        with open(SPOOL_DEAD_PATH, 'ab') as f:
+            f.write(dead)
+    if rest:
+        _write_file_atomic(SPOOL_PATH, rest)
+    elif os.path.exists(SPOOL_PATH):
+        os.remove(SPOOL_PATH)
+
+
+def _write_state_files(wal_line: Optional[bytes], snapshot: Optional[bytes]) -> None:
+    """Append a state log line, or replace the snapshot (which folds in and drops the log)."""
+    if snapshot is not None:
+        _write_file_atomic(STATE_FILE, snapshot)
+        if os.path.exists(STATE_WAL_FILE):
+            os.remove(STATE_WAL_FILE)
+    else:
+        with open(STATE_WAL_FILE, 'ab') as f:
+            f.write(wal_line)
+
+
+@dataclass(slots=True)
 class ConnectorSchedule:
     """Configuration for a connector's execution schedule."""
     name: str
@@ -38,7 +136,7 @@ class ConnectorSchedule:
             self.config = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class SupervisorStats:
     """Statistics for supervisor operation."""
     start_time: datetime
@@ -49,6 +147,43 @@ class SupervisorStats:
     last_heartbeat: Optional[datetime] = None
 
 
+class CircuitBreaker:
+    """
+    Circuit breaker for the memory store client.
+
+    CLOSED: calls go through. After `threshold` consecutive failures the circuit
+    OPENs and calls are refused for `cooldown` seconds; then one probe call is
+    let through (HALF_OPEN), which closes the circuit on success or re-opens it.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.fail_count = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+        return True
+
+    def on_success(self) -> None:
+        self.state = self.CLOSED
+        self.fail_count = 0
+
+    def on_failure(self) -> None:
+        self.fail_count += 1
+        if self.state == self.HALF_OPEN or self.fail_count >= self.threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
 class SupervisorService:
     """
     Supervisor service that orchestrates the entire events ingestion pipeline.
@@ -101,17 +236,33 @@ class SupervisorService:
         # Runtime state
         self.stats = SupervisorStats(start_time=datetime.now())
         self.connector_states = {}  # name -> state dict
+        self._state_dirty: Set[str] = set()  # connectors whose state changed since the last save
+        self._wal_writes = 0
+        self._last_state_save = 0.0  # time.monotonic() of the last periodic save
+        self._cycle = 0  # supervision cycles run, for throttling the stats log
+        self._config_save_task: Optional[asyncio.Task] = None  # the one config save in progress
+        self._config_save_again = False  # config changed while that save was running
         self.running = False
         self.tasks = {}  # name -> asyncio.Task
+        self._session: Optional[aiohttp.ClientSession] = None  # memory store client, lives between start() and stop()
+        self._out_queue: Optional[asyncio.Queue] = None  # record lists waiting for the flusher
+        self._flusher: Optional[asyncio.Task] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None  # runs blocking connector fetches
+        self._breaker = CircuitBreaker()
+        self._spool_head_failures = 0  # failed replays of the spool's first batch
 
         # Load configuration and state
         self._load_config()
         self._load_state()
 
-    def send_records_to_memory_store(self, records: List[IngestionRecord]) -> bool:
+    async def send_records_to_memory_store(self, records: List[IngestionRecord]) -> bool:
         """
         Send records to the memory store for ingestion service to consume.
 
+        Overload responses (429/5xx) and connection errors/timeouts are retried
+        with exponential backoff and full jitter, so a struggling memory store
+        gets room to recover instead of a steady stream of retries.
+
         Args:
             records: List of IngestionRecord objects to send
 
@@ -121,36 +272,188 @@ class SupervisorService:
         if not records:
             return True
 
+        body = self._encode_records(records)
+        if body is None:
+            return False
+        return await self._send_body(body, len(records)) == 200
+
+    def _encode_records(self, records: List[IngestionRecord]) -> Optional[bytes]:
+        """Encode records as a memory store POST body; None if they cannot be encoded."""
         try:
-            # Convert records to dicts for JSON serialization
+            # Convert records to dicts and send them as msgpack (smaller and
+            # cheaper to encode/decode than JSON)
             records_data = [record.to_dict() for record in records]
 
             payload = {"key": "raw_items", "value": records_data}
+            return msgpack.packb(payload, use_bin_type=True)
+        except Exception as e:
+            logger.error(f"Error encoding records for memory store: {e}")
+            return None
 
-            response = requests.post(
-                f"{self.memory_store_url}/post",
-                json=payload,
-                timeout=30
-            )
+    async def _send_body(self, body: bytes, count: int) -> Optional[int]:
+        """
+        POST an encoded batch, retrying overload responses and connection errors.
 
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"Successfully sent {len(records)} records to memory store: {result.get('queue_size', 0)} items in queue")
-                return True
-            else:
-                logger.error(f"Failed to send records to memory store: {response.status_code} - {response.text}")
-                return False
+        Returns the last HTTP status (200 on success), or None if the last
+        attempt got no response.
+        """
+        status = None
+        for attempt in range(SEND_MAX_RETRIES + 1):
+            status = await self._post_to_memory_store(body, count)
+            if status == 200 or (status is not None and status not in RETRYABLE_STATUSES):
+                return status
+            if attempt == SEND_MAX_RETRIES:
+                break
+
+            delay = random.uniform(0, min(SEND_BACKOFF_CAP_S, SEND_BACKOFF_BASE_S * 2 ** attempt))
+            logger.warning(f"Memory store unavailable, retrying in {delay:.1f}s (attempt {attempt + 1}/{SEND_MAX_RETRIES})")
+            await asyncio.sleep(delay)
+
+        return status
+
+    async def _post_to_memory_store(self, body: bytes, count: int) -> Optional[int]:
+        """POST one encoded batch; returns the HTTP status, or None on connection error/timeout."""
+        try:
+            async with self._session.post(
+                f"{self.memory_store_url}/post",
+                data=body,
+                headers={"Content-Type": "application/msgpack"},
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    logger.info(f"Successfully sent {count} records to memory store: {result.get('queue_size', 0)} items in queue")
+                else:
+                    logger.error(f"Failed to send records to memory store: {response.status} - {await response.text()}")
+                return response.status
 
         except Exception as e:
             logger.error(f"Error sending records to memory store: {e}")
-            return False
+            return None
+
+    async def _flush_loop(self) -> None:
+        """
+        Drain the outgoing queue, sending up to OUT_BATCH_MAX records per POST.
+        A batch is sent once it is full or OUT_FLUSH_S after its first records.
+        A None item flushes what is pending and stops the loop.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._out_queue.get()
+            if first is None:
+                break
+
+            batch = list(first)
+            deadline = loop.time() + OUT_FLUSH_S
+            while len(batch) < OUT_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    more = await asyncio.wait_for(self._out_queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if more is None:
+                    stopping = True
+                    break
+                batch.extend(more)
+
+            try:
+                body = self._encode_records(batch)
+                if body is not None:
+                    await self._deliver(body, len(batch))
+            except Exception as e:
+                logger.error(f"Error flushing {len(batch)} records: {e}")
+
+    async def _deliver(self, body: bytes, count: int) -> None:
+        """Send a batch through the circuit breaker, spooling it while the circuit is open."""
+        if not self._breaker.allow():
+            self._spool(body, count)
+            return
+
+        if await self._send_body(body, count) == 200:
+            self._breaker.on_success()
+            await self._drain_spool()
+            return
+
+        self._breaker.on_failure()
+        if self._breaker.state == CircuitBreaker.OPEN:
+            logger.warning(f"Memory store circuit open for {self._breaker.cooldown:.0f}s, spooling records to {SPOOL_PATH}")
+            self._spool(body, count)
+        else:
+            logger.error(f"Failed to send {count} records to memory store")
+
+    def _spool(self, body: bytes, count: int) -> None:
+        """Append an encoded batch to the disk spool, unless the spool is full."""
+        try:
+            size = os.path.getsize(SPOOL_PATH) if os.path.exists(SPOOL_PATH) else 0
+            if size + len(body) + 8 > SPOOL_MAX_BYTES:
+                logger.error(f"Spool {SPOOL_PATH} is full, dropping {count} records")
+                return
+            with open(SPOOL_PATH, 'ab') as f:
+                f.write(len(body).to_bytes(4, 'big') + count.to_bytes(4, 'big') + body)
+        except Exception as e:
+            logger.error(f"Could not spool {count} records: {e}")
+
+    async def _drain_spool(self) -> None:
+        """
+        Replay spooled batches in order (file I/O on a worker thread).
+
+        Batches the memory store rejects outright (non-retryable status) are
+        dropped; replay stops at the first retryable failure and the rest stays
+        spooled. A batch that has failed SPOOL_MAX_REPLAYS replays is moved to
+        SPOOL_DEAD_PATH instead. A torn last frame from a crash mid-append is
+        truncated.
+        """
+        if not os.path.exists(SPOOL_PATH):
+            return
+
+        try:
+            data = await asyncio.to_thread(_read_file, SPOOL_PATH)
+        except Exception as e:
+            logger.error(f"Could not read spool {SPOOL_PATH}: {e}")
+            return
+
+        frames = list(_spool_frames(data))
+        valid_end = frames[-1][0] if frames else 0
+        if valid_end < len(data):
+            logger.warning(f"Truncating {len(data) - valid_end} bytes of torn data at the end of spool {SPOOL_PATH}")
+
+        pos = 0
+        sent = dropped = 0
+        dead = []
+        for end, count, body in frames:
+            status = await self._send_body(body, count)
+            if status == 200:
+                sent += 1
+            elif status is not None and status not in RETRYABLE_STATUSES:
+                logger.error(f"Memory store rejected {count} spooled records ({status}), dropping them")
+                dropped += 1
+            else:
+                self._spool_head_failures += 1
+                if self._spool_head_failures < SPOOL_MAX_REPLAYS:
+                    self._breaker.on_failure()
+                    break
+                logger.error(f"{count} spooled records failed {self._spool_head_failures} replays, moving them to {SPOOL_DEAD_PATH}")
+                dead.append(data[pos:end])
+            self._spool_head_failures = 0
+            pos = end
+
+        if pos or valid_end < len(data):
+            try:
+                await asyncio.to_thread(_rewrite_spool, data[pos:valid_end], b''.join(dead))
+            except Exception as e:
+                logger.error(f"Could not update spool {SPOOL_PATH}: {e}")
+
+        if sent or dropped or dead:
+            logger.info(f"Replayed {sent} spooled batches to memory store, dropped {dropped}, dead-lettered {len(dead)}")
 
     def _load_config(self) -> None:
         """Load supervisor configuration."""
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    config = orjson.loads(f.read())
 
                 # Update schedules from config
                 for name, schedule_config in config.get('schedules', {}).items():
@@ -165,8 +468,8 @@ class SupervisorService:
         except Exception as e:
             logger.warning(f"Could not load supervisor config: {e}")
 
-    def _save_config(self) -> None:
-        """Save supervisor configuration."""
+    async def _save_config(self) -> None:
+        """Save supervisor configuration (written on a worker thread)."""
         try:
             config = {
                 'schedules': {
@@ -179,37 +482,88 @@ class SupervisorService:
                 }
             }
 
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            await asyncio.to_thread(_write_file_atomic, self.config_path, data)
 
         except Exception as e:
             logger.error(f"Could not save supervisor config: {e}")
 
     def _load_state(self) -> None:
-        """Load connector states."""
+        """Load connector states: the snapshot, then any updates logged after it."""
         try:
-            state_file = "supervisor_state.json"
-            if os.path.exists(state_file):
-                with open(state_file, 'r') as f:
-                    self.connector_states = json.load(f)
-                logger.info(f"Loaded supervisor state from {state_file}")
+            if os.path.exists(STATE_FILE):
+                with open(STATE_FILE, 'rb') as f:
+                    self.connector_states = orjson.loads(f.read())
+                logger.info(f"Loaded supervisor state from {STATE_FILE}")
+
+            if os.path.exists(STATE_WAL_FILE):
+                with open(STATE_WAL_FILE, 'rb') as f:
+                    for line in f:
+                        try:
+                            self.connector_states.update(orjson.loads(line))
+                        except orjson.JSONDecodeError:
+                            break  # torn last line from a crash mid-write
+                        self._wal_writes += 1
         except Exception as e:
             logger.warning(f"Could not load supervisor state: {e}")
 
-    def _save_state(self) -> None:
-        """Save connector states."""
+    def update_connector_state(self, name: str, state: Dict[str, Any]) -> None:
+        """
+        Replace a connector's persisted state; written out on the next save.
+
+        The connector loops record each run's outcome here (last run, record
+        count, duration, and the last error with a consecutive error count).
+        """
+        self.connector_states[name] = state
+        self._state_dirty.add(name)
+
+    async def _save_state(self, compact: bool = False) -> None:
+        """
+        Save connector states.
+
+        Only connectors changed since the last save are written, as one log line
+        each; the snapshot is rewritten (atomically) every STATE_COMPACT_EVERY
+        saves or when compact=True. Serialization happens here, the file writes
+        on a worker thread so the event loop never waits on the disk.
+        """
         try:
-            state_file = "supervisor_state.json"
-            with open(state_file, 'w') as f:
-                json.dump(self.connector_states, f, indent=2)
+            wal_line = snapshot = None
+            if self._state_dirty:
+                delta = {name: self.connector_states.get(name, {}) for name in self._state_dirty}
+                wal_line = orjson.dumps(delta) + b'\n'
+                self._state_dirty.clear()
+                self._wal_writes += 1
+
+            if self._wal_writes and (compact or self._wal_writes >= STATE_COMPACT_EVERY):
+                snapshot = orjson.dumps(self.connector_states, option=orjson.OPT_INDENT_2)
+                self._wal_writes = 0
+
+            if wal_line is not None or snapshot is not None:
+                await asyncio.to_thread(_write_state_files, wal_line, snapshot)
         except Exception as e:
             logger.error(f"Could not save supervisor state: {e}")
+            self._state_dirty.update(self.connector_states)  # rewrite everything next time
 
     async def start(self) -> None:
         """Start the supervisor service."""
         logger.info("Starting Supervisor Service")
         self.running = True
 
+        # One pooled keep-alive session for all memory store POSTs
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+        # Connector loops push record lists here; one flusher batches them into POSTs.
+        # The bound gives backpressure if the memory store falls behind.
+        self._out_queue = asyncio.Queue(maxsize=1000)
+        self._flusher = asyncio.create_task(self._flush_loop())
+        # One thread per connector so a slow fetch never waits on another one
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, len(self.connector_schedules)),
+            thread_name_prefix="connector",
+        )
+
         try:
             # Start all enabled connectors
             await self._start_all_connectors()
@@ -218,7 +572,7 @@ class SupervisorService:
             while self.running:
                 try:
                     await self._supervision_cycle()
-                    await asyncio.sleep(10)  # Check every 10 seconds
+                    await self._wait_for_task_exit(10)  # Check every 10 seconds, or as soon as a connector dies
                 except Exception as e:
                     logger.error(f"Error in supervision cycle: {e}")
                     await asyncio.sleep(30)  # Wait before retry
@@ -234,7 +588,7 @@ class SupervisorService:
         self.running = False
 
         # Cancel all connector tasks
-        if hasattr(self, 'tasks') and self.tasks:
+        if self.tasks:
             for name, task in self.tasks.items():
                 if not task.done():
                     task.cancel()
@@ -242,8 +596,25 @@ class SupervisorService:
             # Wait for tasks to complete
             await asyncio.gather(*self.tasks.values(), return_exceptions=True)
 
-        # Save final state
-        self._save_state()
+        # Let the flusher send what is still queued, then close the session
+        if self._flusher is not None:
+            await self._out_queue.put(None)
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        # Save final state (and let a pending config save finish)
+        if self._config_save_task is not None:
+            await asyncio.gather(self._config_save_task, return_exceptions=True)
+            self._config_save_task = None
+        await self._save_state(compact=True)
 
         # Log final stats
         logger.info(f"Supervisor stopped. Final stats: {asdict(self.stats)}")
@@ -254,9 +625,13 @@ class SupervisorService:
             if schedule.enabled:
                 await self._start_connector(name, schedule)
 
+    def _is_running(self, name: str) -> bool:
+        task = self.tasks.get(name)
+        return task is not None and not task.done()
+
     async def _start_connector(self, name: str, schedule: ConnectorSchedule) -> None:
         """Start a single connector."""
-        if hasattr(self, 'tasks') and name in self.tasks and not self.tasks[name].done():
+        if self._is_running(name):
             return  # Already running
 
         # Create connector instance
@@ -277,29 +652,42 @@ class SupervisorService:
             logger.error(f"Failed to start connector {name}: {e}")
 
     async def _run_connector_loop(self, name: str, connector, schedule: ConnectorSchedule) -> None:
-        """Run connector in a loop with scheduling."""
+        """Run connector in a loop with scheduling; the connector is closed when the loop ends."""
         logger.info(f"Starting connector loop for {name}")
+        try:
+            await self._connector_loop(name, connector, schedule)
+        finally:
+            # A restart builds a new connector instance; release this one's pools
+            try:
+                connector.close()
+            except Exception as e:
+                logger.error(f"Error closing connector {name}: {e}")
 
+    async def _connector_loop(self, name: str, connector, schedule: ConnectorSchedule) -> None:
         while self.running:
             try:
                 start_time = time.time()
 
-                # Run connector fetch
-                records = list(connector.fetch())
-
-                # Send records to memory store
-                if records:
-                    success = self.send_records_to_memory_store(records)
-                    if not success:
-                        logger.error(f"Failed to send {len(records)} records from {name} to memory store")
+                # Run connector fetch, streaming records to the flusher (which batches
+                # them into memory store POSTs) as they are produced
+                count = 0
+                async for chunk in self._fetch_chunks(connector):
+                    await self._out_queue.put(chunk)
+                    count += len(chunk)
+                    self.stats.records_processed += len(chunk)
 
                 # Update stats
                 self.stats.connectors_completed += 1
-                self.stats.records_processed += len(records)
 
                 # Log success
                 duration = time.time() - start_time
-                logger.info(f"Connector {name} completed: {len(records)} records in {duration:.1f}s")
+                logger.info(f"Connector {name} completed: {count} records in {duration:.1f}s")
+                self.update_connector_state(name, {
+                    'last_run': datetime.now().isoformat(),
+                    'last_records': count,
+                    'last_duration_s': round(duration, 1),
+                    'consecutive_errors': 0,
+                })
 
                 # Wait for next interval
                 await asyncio.sleep(schedule.interval_seconds)
@@ -307,10 +695,47 @@ class SupervisorService:
             except Exception as e:
                 logger.error(f"Error in connector {name}: {e}")
                 self.stats.errors += 1
+                state = self.connector_states.get(name, {})
+                self.update_connector_state(name, {
+                    **state,
+                    'last_error': str(e),
+                    'last_error_at': datetime.now().isoformat(),
+                    'consecutive_errors': state.get('consecutive_errors', 0) + 1,
+                })
 
                 # Wait before retry (with backoff)
                 await asyncio.sleep(min(schedule.interval_seconds, 300))  # Max 5 minutes
 
+    async def _fetch_chunks(self, connector):
+        """
+        Yield a connector's records in lists of up to FETCH_CHUNK.
+
+        fetch() is a blocking generator, so each chunk is pulled on the connector
+        thread pool; sending starts with the first chunk instead of after the whole
+        fetch has been materialized.
+        """
+        loop = asyncio.get_running_loop()
+        it = await loop.run_in_executor(self._executor, lambda: iter(connector.fetch()))
+        while True:
+            chunk = await loop.run_in_executor(self._executor, lambda: list(itertools.islice(it, FETCH_CHUNK)))
+            if not chunk:
+                return
+            yield chunk
+
+    async def _wait_for_task_exit(self, timeout: float) -> None:
+        """
+        Sleep until the timeout or until any connector task finishes.
+
+        Connector loops wait out their intervals in asyncio.sleep, which the event
+        loop already keeps in a single timer heap, so the only polling left is
+        this one; waking on task exit restarts dead connectors without delay.
+        """
+        running = [task for task in self.tasks.values() if not task.done()]
+        if running:
+            await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        else:
+            await asyncio.sleep(timeout)
+
     async def _supervision_cycle(self) -> None:
         """Perform supervision tasks."""
         # Update heartbeat
@@ -318,15 +743,19 @@ class SupervisorService:
 
         # Check for dead tasks and restart them
         for name, schedule in self.connector_schedules.items():
-            if schedule.enabled and (not hasattr(self, 'tasks') or name not in self.tasks or self.tasks[name].done()):
+            if schedule.enabled and not self._is_running(name):
                 logger.warning(f"Connector {name} task is dead, restarting")
                 await self._start_connector(name, schedule)
 
-        # Save state periodically
-        self._save_state()
+        # Save changed state periodically
+        self._cycle += 1
+        now = time.monotonic()
+        if self._state_dirty and now - self._last_state_save > STATE_SAVE_INTERVAL_S:
+            await self._save_state()
+            self._last_state_save = now
 
         # Log stats periodically
-        if self.stats.connectors_completed % 10 == 0:
+        if self._cycle % 10 == 0:
             logger.info(f"Supervisor stats: {asdict(self.stats)}")
 
     def get_status(self) -> Dict[str, Any]:
@@ -338,7 +767,7 @@ class SupervisorService:
                 name: {
                     'enabled': schedule.enabled,
                     'interval': schedule.interval_seconds,
-                    'running': hasattr(self, 'tasks') and name in self.tasks and not self.tasks[name].done(),
+                    'running': self._is_running(name),
                     'state': self.connector_states.get(name, {})
                 }
                 for name, schedule in self.connector_schedules.items()
@@ -346,13 +775,40 @@ class SupervisorService:
             'ingestion_queue_size': self.ingestion_service.get_queue_size() if self.ingestion_service else 0
         }
 
+    def _schedule_config_save(self) -> None:
+        """
+        Save config from sync callers: as a task on the running loop, else inline.
+
+        At most one save task runs at a time; changes made while it runs are
+        coalesced into one more save after it, so writes never overlap and the
+        latest config is the one left on disk.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._save_config())
+            return
+
+        if self._config_save_task is not None and not self._config_save_task.done():
+            self._config_save_again = True
+        else:
+            self._config_save_task = asyncio.create_task(self._config_save_loop())
+
+    async def _config_save_loop(self) -> None:
+        """Save config until no change arrived during the last save."""
+        while True:
+            self._config_save_again = False
+            await self._save_config()
+            if not self._config_save_again:
+                return
+
     def enable_connector(self, name: str, enabled: bool = True) -> bool:
         """Enable or disable a connector."""
         if name not in self.connector_schedules:
             return False
 
         self.connector_schedules[name].enabled = enabled
-        self._save_config()
+        self._schedule_config_save()
 
         if enabled:
             # Start connector if supervisor is running
@@ -360,7 +816,7 @@ class SupervisorService:
                 asyncio.create_task(self._start_connector(name, self.connector_schedules[name]))
         else:
             # Stop connector if running
-            if hasattr(self, 'tasks') and name in self.tasks and not self.tasks[name].done():
+            if self._is_running(name):
                 self.tasks[name].cancel()
 
         return True
@@ -371,7 +827,7 @@ class SupervisorService:
             return False
 
         self.connector_schedules[name].config.update(config)
-        self._save_config()
+        self._schedule_config_save()
         return True
 
 
@@ -396,4 +852,7 @@ async def start_supervisor() -> None:
     await supervisor.start()
 
 if __name__ == "__main__":
-    asyncio.run(start_supervisor())
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(start_supervisor())
+    else:
+        asyncio.run(start_supervisor())
\ No newline at end of file
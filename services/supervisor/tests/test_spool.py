@@ -0,0 +1,94 @@
+# test_spool.py
+#
+# Disk spool of the supervisor's memory store client: frame parsing (including
+# a torn last frame) and replay (sent, rejected and retryable batches).
+#
+# Run:
+#   pytest -q services/supervisor/tests/
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(_HERE), os.path.abspath(os.path.join(_HERE, "..", "..", ".."))]
+
+import supervisor  # noqa: E402
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(supervisor, "SPOOL_PATH", str(tmp_path / "spool.bin"))
+    monkeypatch.setattr(supervisor, "SPOOL_DEAD_PATH", str(tmp_path / "spool.dead"))
+    monkeypatch.setattr(supervisor, "SEND_MAX_RETRIES", 0)
+    return supervisor.SupervisorService(config_path=str(tmp_path / "config.json"))
+
+
+def _script(service, statuses):
+    """Make the memory store answer with `statuses` in turn; returns the bodies posted."""
+    posted = []
+    answers = iter(statuses)
+
+    async def post(body, count):
+        posted.append(body)
+        return next(answers)
+
+    service._post_to_memory_store = post
+    return posted
+
+
+def test_frames_skip_torn_tail(service):
+    for i in range(3):
+        service._spool(b"batch%d" % i, i + 1)
+    with open(supervisor.SPOOL_PATH, "ab") as f:
+        f.write((100).to_bytes(4, "big") + (5).to_bytes(4, "big") + b"partial")
+
+    with open(supervisor.SPOOL_PATH, "rb") as f:
+        frames = list(supervisor._spool_frames(f.read()))
+
+    assert [(count, body) for _, count, body in frames] == [(1, b"batch0"), (2, b"batch1"), (3, b"batch2")]
+
+
+def test_drain_drops_rejected_and_stops_on_retryable(service):
+    for i in range(4):
+        service._spool(b"batch%d" % i, 1)
+
+    posted = _script(service, [200, 400, 503])
+    asyncio.run(service._drain_spool())
+
+    assert posted == [b"batch0", b"batch1", b"batch2"]
+    with open(supervisor.SPOOL_PATH, "rb") as f:
+        left = [body for _, _, body in supervisor._spool_frames(f.read())]
+    assert left == [b"batch2", b"batch3"]
+
+
+def test_drain_truncates_torn_tail_and_removes_spool(service):
+    service._spool(b"batch0", 1)
+    with open(supervisor.SPOOL_PATH, "ab") as f:
+        f.write(b"\x00\x00")
+
+    posted = _script(service, [200])
+    asyncio.run(service._drain_spool())
+
+    assert posted == [b"batch0"]
+    assert not os.path.exists(supervisor.SPOOL_PATH)
+
+
+def test_drain_dead_letters_a_batch_that_keeps_failing(service, monkeypatch):
+    monkeypatch.setattr(supervisor, "SPOOL_MAX_REPLAYS", 3)
+    service._spool(b"poison", 1)
+    service._spool(b"batch1", 1)
+
+    posted = _script(service, [500, 500, 500, 200])
+    for _ in range(3):
+        asyncio.run(service._drain_spool())
+
+    assert posted == [b"poison", b"poison", b"poison", b"batch1"]
+    assert not os.path.exists(supervisor.SPOOL_PATH)
+    with open(supervisor.SPOOL_DEAD_PATH, "rb") as f:
+        assert [body for _, _, body in supervisor._spool_frames(f.read())] == [b"poison"]
@@ -26,7 +26,12 @@ def close_database():
 
 
 def initialize_database():
-    """Create all tables if they don't exist"""
+    """
+    Create all tables if they don't exist.
+
+    Also creates the model indexes, including the unique (source, source_id)
+    index on normalized_items that ingestion's ON CONFLICT inserts rely on.
+    """
     from .models import NormalizedItem, Cluster
 
     logger.info("Initializing PostgreSQL database...")
@@ -42,7 +42,8 @@ CREATE INDEX IF NOT EXISTS idx_normalized_items_source_id ON normalized_items(so
 CREATE INDEX IF NOT EXISTS idx_normalized_items_collected_at ON normalized_items(collected_at);
 CREATE INDEX IF NOT EXISTS idx_normalized_items_published_at ON normalized_items(published_at);
 CREATE INDEX IF NOT EXISTS idx_normalized_items_cluster_id ON normalized_items(cluster_id);
-CREATE INDEX IF NOT EXISTS idx_normalized_items_source_source_id ON normalized_items(source, source_id);
+-- Unique: ingestion relies on ON CONFLICT (source, source_id) DO NOTHING for dedup
+CREATE UNIQUE INDEX IF NOT EXISTS idx_normalized_items_source_source_id ON normalized_items(source, source_id);
 CREATE INDEX IF NOT EXISTS idx_normalized_items_lat_lon ON normalized_items(lat, lon);
 
 -- Create indexes for clusters
@@ -7,9 +7,15 @@ All database tables are created via init.sql when PostgreSQL container starts.
 
 import uuid
 import json
-from datetime import datetime, timezone
+import hashlib
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, asdict, fields
+from dataclasses import dataclass, field, fields
+
+try:
+    import orjson
+except ImportError:  # optional; services without it fall back to stdlib json
+    orjson = None
 
 # Helper function for timezone-aware datetime
 def utcnow():
@@ -17,7 +23,7 @@ def utcnow():
 
 from peewee import (
     Model, CharField, TextField, DateTimeField, DoubleField, IntegerField,
-    FloatField, ForeignKeyField
+    FloatField, ForeignKeyField, EXCLUDED, chunked
 )
 
 from .database import BaseModel, database
@@ -55,6 +61,36 @@ class NormalizedItem(BaseModel):
             (('lat', 'lon'), False),  # location index
         )
 
+    @classmethod
+    def bulk_upsert(cls, rows: List[Dict[str, Any]], batch: int = 500) -> int:
+        """
+        Insert column dicts in multi-row INSERTs of up to `batch` rows, one transaction.
+
+        Rows whose (source, source_id) already exists get their content columns
+        overwritten; cluster_id is left alone so re-ingesting does not unassign items.
+        Rows repeating a (source, source_id) are collapsed first, the last one
+        winning, since PostgreSQL rejects an upsert that hits one row twice.
+        Returns the number of rows inserted or updated.
+        """
+        rows = list({(row['source'], row['source_id']): row for row in rows}.values())
+        update = {
+            field: getattr(EXCLUDED, field.column_name)
+            for field in (
+                cls.collected_at, cls.published_at, cls.title, cls.text, cls.url,
+                cls.media_urls, cls.entities, cls.location_name, cls.lat, cls.lon,
+                cls.author,
+            )
+        }
+        count = 0
+        with cls._meta.database.atomic():
+            for chunk in chunked(rows, batch):
+                count += (cls
+                    .insert_many(chunk)
+                    .on_conflict(conflict_target=[cls.source, cls.source_id], update=update)
+                    .as_rowcount()
+                    .execute())
+        return count
+
     def get_media_urls(self) -> List[str]:
         """Get media_urls as a list."""
         if not self.media_urls:
@@ -128,7 +164,7 @@ class Cluster(BaseModel):
 # Dataclasses (for ingestion records, not database models)
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class IngestionRecord:
     """
     Unified ingestion record schema.
@@ -158,29 +194,38 @@ class IngestionRecord:
     # Debug info
     raw: Optional[Dict[str, Any]] = None  # original payload for debugging
 
+    # get_hash() cache; not part of the record schema
+    _hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        data = asdict(self)
+        """
+        Convert to dictionary for JSON serialization.
 
+        Nested values (entities, raw, media_urls) are referenced, not copied;
+        asdict() deep-copied every payload only for it to be serialized.
+        """
         # Remove None values for cleaner JSON
-        return {k: v for k, v in data.items() if v is not None}
+        data = {}
+        for name in _RECORD_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
 
     def to_json(self) -> str:
         """Convert to JSON string."""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS).decode()
         return json.dumps(self.to_dict(), ensure_ascii=False)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'IngestionRecord':
         """Create record from dictionary."""
-        # Get valid field names from the dataclass
-        valid_fields = {f.name for f in fields(cls)}
-
         # Filter out unknown fields
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
+        filtered_data = {k: v for k, v in data.items() if k in _FIELD_NAMES}
 
         # Validate required fields are present
-        required_fields = {'source', 'source_id', 'collected_at'}
-        missing_fields = required_fields - set(filtered_data.keys())
+        missing_fields = {f for f in _REQUIRED_FIELDS if f not in filtered_data}
         if missing_fields:
             raise ValueError(f"Missing required fields: {missing_fields}")
 
@@ -189,17 +234,24 @@ class IngestionRecord:
     @classmethod
     def from_json(cls, json_str: str) -> 'IngestionRecord':
         """Create record from JSON string."""
-        data = json.loads(json_str)
+        data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
         return cls.from_dict(data)
 
     def get_hash(self) -> str:
         """
         Generate a hash for deduplication based on source and source_id.
         This ensures we don't store duplicate records from the same source.
+        The digest is computed once per record and cached on the instance.
         """
-        import hashlib
-        key = f"{self.source}:{self.source_id}"
-        return hashlib.sha256(key.encode()).hexdigest()
+        h = self._hash
+        if h is None:
+            h = self._hash = hashlib.sha256(f"{self.source}:{self.source_id}".encode()).hexdigest()
+        return h
+
+    @staticmethod
+    def bulk_hash(records: List['IngestionRecord']) -> List[str]:
+        """Deduplication hashes for a batch of records, in order."""
+        return [r.get_hash() for r in records]
 
     def has_location(self) -> bool:
         """Check if record has geographic coordinates."""
@@ -215,6 +267,12 @@ class IngestionRecord:
         return None
 
 
+# Field names in declaration order, resolved once
+_RECORD_FIELDS = tuple(f.name for f in fields(IngestionRecord) if f.name != '_hash')
+_FIELD_NAMES = frozenset(_RECORD_FIELDS)
+_REQUIRED_FIELDS = frozenset({'source', 'source_id', 'collected_at'})
+_VALID_SOURCES = frozenset({'gdelt', 'telegram', 'mastodon', 'adsb', 'ais', 'rss'})
+
 # Type aliases for clarity
 RecordList = List[IngestionRecord]
 RecordDict = Dict[str, Any]
@@ -230,7 +288,7 @@ def validate_record(record: IngestionRecord) -> List[str]:
 
     if not record.source:
         errors.append("source is required")
-    elif record.source not in {'gdelt', 'telegram', 'mastodon', 'adsb', 'ais', 'rss'}:
+    elif record.source not in _VALID_SOURCES:
         errors.append(f"invalid source: {record.source}")
 
     if not record.source_id:
@@ -255,7 +313,7 @@ def validate_record(record: IngestionRecord) -> List[str]:
 
 def get_recent_events(hours: int = 24, limit: int = 1000) -> List[NormalizedItem]:
     """Get recent events with location data."""
-    since = datetime.utcnow().replace(hour=datetime.utcnow().hour - hours)
+    since = utcnow() - timedelta(hours=hours)
     return (NormalizedItem
             .select()
             .where((NormalizedItem.published_at >= since) &
@@ -267,7 +325,7 @@ def get_recent_events(hours: int = 24, limit: int = 1000) -> List[NormalizedItem
 
 def get_active_clusters(hours: int = 1, min_items: int = 2) -> List[Cluster]:
     """Get recently active clusters."""
-    since = datetime.utcnow().replace(hour=datetime.utcnow().hour - hours)
+    since = utcnow() - timedelta(hours=hours)
     return (Cluster
             .select()
             .where((Cluster.updated_at >= since) &
@@ -0,0 +1,51 @@
+# test_models.py
+#
+# NormalizedItem.bulk_upsert against an in-memory SQLite database (which also
+# supports INSERT ... ON CONFLICT DO UPDATE).
+#
+# Run:
+#   pytest -q shared/tests/
+
+from __future__ import annotations
+
+import pytest
+from peewee import SqliteDatabase
+
+from shared.models.models import NormalizedItem
+
+
+@pytest.fixture
+def db():
+    test_db = SqliteDatabase(":memory:")
+    with test_db.bind_ctx([NormalizedItem]):
+        test_db.create_tables([NormalizedItem])
+        yield test_db
+    test_db.close()
+
+
+def _row(source_id: str, title: str) -> dict:
+    return {"source": "rss", "source_id": source_id, "title": title}
+
+
+def test_bulk_upsert_inserts_in_batches(db):
+    count = NormalizedItem.bulk_upsert([_row(str(i), f"t{i}") for i in range(7)], batch=3)
+
+    assert count == 7
+    assert NormalizedItem.select().count() == 7
+
+
+def test_bulk_upsert_updates_content_but_keeps_cluster(db):
+    NormalizedItem.bulk_upsert([_row("1", "old")])
+    NormalizedItem.update(cluster_id="c1").execute()
+
+    NormalizedItem.bulk_upsert([_row("1", "new")])
+
+    item = NormalizedItem.get()
+    assert (item.title, item.cluster_id) == ("new", "c1")
+
+
+def test_bulk_upsert_collapses_repeated_keys_last_wins(db):
+    count = NormalizedItem.bulk_upsert([_row("1", "first"), _row("2", "other"), _row("1", "last")])
+
+    assert count == 2
+    assert NormalizedItem.get(NormalizedItem.source_id == "1").title == "last"
@@ -0,0 +1,39 @@
+# test_time_utils.py
+#
+# Twitter timestamp conversion: the fixed-width fast path must agree with
+# strptime, including rejecting out-of-range fields.
+#
+# Run:
+#   pytest -q shared/tests/
+
+from __future__ import annotations
+
+import pytest
+
+from shared.utils.time_utils import format_time_to_iso, format_time_to_ljubljana
+
+
+@pytest.mark.parametrize("ts, expected", [
+    ("Wed Oct 10 20:19:24 +0000 2018", "2018-10-10T20:19:24Z"),
+    ("Wed Oct 10 20:19:24 +0200 2018", "2018-10-10T18:19:24Z"),
+    ("Wed Oct 10 23:30:00 -0130 2018", "2018-10-11T01:00:00Z"),
+])
+def test_format_time_to_iso(ts, expected):
+    assert format_time_to_iso(ts) == expected
+
+
+def test_format_time_to_ljubljana():
+    assert format_time_to_ljubljana("Wed Oct 10 20:19:24 +0000 2018") == "2018-10-10 22:19:24"
+
+
+@pytest.mark.parametrize("ts", [
+    "Wed Oct 99 99:99:99 +0000 2018",
+    "Wed Feb 30 10:00:00 +0000 2018",
+    "Wed Foo 10 20:19:24 +0000 2018",
+    "not a timestamp",
+])
+def test_invalid_timestamps_raise(ts):
+    with pytest.raises(ValueError):
+        format_time_to_iso(ts)
+    with pytest.raises(ValueError):
+        format_time_to_ljubljana(ts)
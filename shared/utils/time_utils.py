@@ -1,10 +1,43 @@
 """Time formatting utilities"""
 import datetime
+import functools
 import logging
+import sys
+
+import pytz
 
 logger = logging.getLogger(__name__)
 
+_LJUBLJANA_TZ = pytz.timezone('Europe/Ljubljana')
+_TWITTER_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+# fromisoformat parses a trailing 'Z' (and is a full ISO 8601 parser in C) since 3.11
+_FROMISOFORMAT_PARSES_Z = sys.version_info >= (3, 11)
+_MONTHS = {m: i for i, m in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+
+def _parse_twitter_time(s: str):
+    """
+    Parse a Twitter timestamp ('Wed Oct 10 20:19:24 +0000 2018') into
+    (naive wall-clock datetime, utc_offset_seconds).
+
+    The format is fixed-width, so this slices the fields directly instead of
+    going through strptime; anything that does not fit, including out-of-range
+    fields, falls back to strptime (which raises ValueError on bad input).
+    """
+    try:
+        if len(s) == 30 and s[25] == ' ' and s[20] in '+-':
+            offset = int(s[21:23]) * 3600 + int(s[23:25]) * 60
+            dt = datetime.datetime(int(s[26:30]), _MONTHS[s[4:7]], int(s[8:10]),
+                                   int(s[11:13]), int(s[14:16]), int(s[17:19]))
+            return dt, -offset if s[20] == '-' else offset
+    except (KeyError, ValueError):
+        pass
+    dt = datetime.datetime.strptime(s, _TWITTER_FORMAT)
+    return dt.replace(tzinfo=None), int(dt.utcoffset().total_seconds())
+
 
+@functools.lru_cache(maxsize=8192)
 def format_time_to_ljubljana(tweet_time_str: str) -> str:
     """
     Convert Twitter timestamp string to Ljubljana timezone format.
@@ -15,14 +48,13 @@ def format_time_to_ljubljana(tweet_time_str: str) -> str:
     Returns:
         Formatted timestamp string in 'YYYY-MM-DD HH:MM:SS' format (Ljubljana timezone)
     """
-    import pytz
-    dt = datetime.datetime.strptime(tweet_time_str, '%a %b %d %H:%M:%S %z %Y')
+    dt, _ = _parse_twitter_time(tweet_time_str)
     timestamp_datetime = dt.replace(tzinfo=datetime.timezone.utc)
-    ljubljana = pytz.timezone('Europe/Ljubljana')
-    ljubljana_time = timestamp_datetime.astimezone(ljubljana)
+    ljubljana_time = timestamp_datetime.astimezone(_LJUBLJANA_TZ)
     return ljubljana_time.strftime('%Y-%m-%d %H:%M:%S')
 
 
+@functools.lru_cache(maxsize=8192)
 def format_time_to_iso(tweet_time_str: str) -> str:
     """
     Convert Twitter timestamp string to ISO 8601 Zulu format.
@@ -33,12 +65,14 @@ def format_time_to_iso(tweet_time_str: str) -> str:
     Returns:
         Formatted timestamp string in ISO 8601 format (e.g., '2024-01-05T14:30:00Z')
     """
-    dt = datetime.datetime.strptime(tweet_time_str, '%a %b %d %H:%M:%S %z %Y')
-    # Convert to UTC
-    utc_dt = dt.astimezone(datetime.timezone.utc)
-    return utc_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+    dt, offset = _parse_twitter_time(tweet_time_str)
+    if offset:
+        # Convert to UTC
+        dt -= datetime.timedelta(seconds=offset)
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_iso_datetime(dt_string: str) -> datetime.datetime:
     """
     Parse ISO datetime string to timezone-aware datetime.
@@ -54,8 +88,9 @@ def parse_iso_datetime(dt_string: str) -> datetime.datetime:
     if not dt_string:
         return None
 
-    # Replace 'Z' with '+00:00' for fromisoformat compatibility
-    dt_string = dt_string.replace('Z', '+00:00')
+    if not _FROMISOFORMAT_PARSES_Z and dt_string.endswith('Z'):
+        # Replace 'Z' with '+00:00' for fromisoformat compatibility
+        dt_string = dt_string[:-1] + '+00:00'
 
     try:
         dt = datetime.datetime.fromisoformat(dt_string)
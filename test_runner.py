@@ -106,28 +106,28 @@ def run_tests():
         print("Dependencies verification failed. Please install missing dependencies.")
         return False
 
-    # Set Python path for imports
-    env = os.environ.copy()
-    env['PYTHONPATH'] = f"{project_root}/services/clustering:{project_root}/shared:{env.get('PYTHONPATH', '')}"
+    # Set Python path for imports (sys.path for this process, PYTHONPATH for any children)
+    import_paths = [f"{project_root}/services/clustering", f"{project_root}/shared"]
+    sys.path[:0] = [p for p in import_paths if p not in sys.path]
+    os.environ['PYTHONPATH'] = ":".join(import_paths + [os.environ.get('PYTHONPATH', '')])
 
     # Set default spaCy model - prefer multilingual for better NER
-    env['SPACY_MODEL'] = env.get('SPACY_MODEL', 'xx_ent_wiki_sm')
+    os.environ['SPACY_MODEL'] = os.environ.get('SPACY_MODEL', 'xx_ent_wiki_sm')
 
-    # Run pytest
-    cmd = [
-        sys.executable, "-m", "pytest",
+    # Run pytest in this interpreter, reusing the modules verify_dependencies imported
+    args = [
         "--tb=short",
         "--verbose",
         "services/clustering/tests/"
     ]
 
     print("Running tests offline...")
-    print(f"Command: {' '.join(cmd)}")
-    print(f"PYTHONPATH: {env['PYTHONPATH']}")
-    print(f"SPACY_MODEL: {env['SPACY_MODEL']}")
+    print(f"pytest args: {' '.join(args)}")
+    print(f"PYTHONPATH: {os.environ['PYTHONPATH']}")
+    print(f"SPACY_MODEL: {os.environ['SPACY_MODEL']}")
 
-    result = subprocess.run(cmd, env=env)
-    return result.returncode == 0
+    import pytest
+    return pytest.main(args) == 0
 
 def main():
     """Main entry point."""
@@ -3,31 +3,89 @@
 Frontend E2E Test Runner using Playwright (Firefox)
 
 - Discovers and runs all *.py scenarios in tests/scenarios/ (except __init__.py)
-- Each scenario runs in a fresh browser context and page
+- Each scenario runs in a fresh page of one shared browser context; a scenario
+  module that sets ISOLATED_CONTEXT = True gets a context of its own
+- A scenario module may define INIT_SCRIPT (JS), injected into its page before navigation
 - Logs to timestamped files: tests/logs/<YYYYMMDD_HHMMSS>__<scenario_name>.log
 - Only initial navigation restricted to localhost
 - Continues on scenario failures
+- Runs up to --concurrency scenarios at once (each in its own page)
 
 Usage:
-  python3 tests/runner.py [--scenario SCENARIO_NAME]
+  python3 tests/runner.py [--scenario SCENARIO_NAME] [--concurrency N]
 
 Options:
   --scenario SCENARIO_NAME    Run only the specified scenario (e.g., scenario_1_page_load)
+  --concurrency N             Max scenarios running at the same time (default: 4)
 """
 
 import argparse
 import asyncio
 import importlib.util
+import os
 import sys
 import time
+import traceback
 from pathlib import Path
+from types import ModuleType
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 from playwright.async_api import async_playwright, ConsoleMessage, Page, Request, Error
 
+from scenarios import ScenarioResult
+
+try:
+    import orjson
+except ImportError:  # optional; console args are then logged with repr()
+    orjson = None
+
 ALLOWED_START_HOSTS = {"localhost", "127.0.0.1", "::1"}
 START_URL = "http://localhost/"
+DEFAULT_CONCURRENCY = 4
+EVENT_QUEUE_SIZE = 256
+# Console levels whose arguments are fetched from the page; others log msg.text only
+_SERIALIZE_ARGS_LEVELS = frozenset({"error", "warning", "assert"})
+# Requests for these are not logged (map tiles alone are hundreds per page);
+# failures and HTTP error responses still are
+_STATIC_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Injected before any page scripts run: surface unhandled errors/rejections into console.error
+_INIT_SCRIPT = """
+(() => {
+  const safeStringify = (v) => {
+    try { return typeof v === 'string' ? v : JSON.stringify(v); }
+    catch { try { return String(v); } catch { return '<unprintable>'; } }
+  };
+
+  window.addEventListener('error', (e) => {
+    // Resource errors sometimes have no stack; still log them
+    const msg = e && e.message ? e.message : 'window error event';
+    const file = e && e.filename ? e.filename : '';
+    const line = e && typeof e.lineno === 'number' ? e.lineno : '';
+    const col  = e && typeof e.colno === 'number' ? e.colno : '';
+    const err  = e && e.error ? e.error : null;
+    const stack = err && err.stack ? err.stack : '';
+    console.error('[window.error]', msg, file, line, col, stack);
+  }, true);
+
+  window.addEventListener('unhandledrejection', (e) => {
+    const r = e ? e.reason : null;
+    const reason = r && r.stack ? r.stack : safeStringify(r);
+    console.error('[unhandledrejection]', reason);
+  });
+
+  // Optional: catch synchronous exceptions not routed elsewhere
+  window.onerror = function(message, source, lineno, colno, error) {
+    const stack = error && error.stack ? error.stack : '';
+    console.error('[window.onerror]', message, source, lineno, colno, stack);
+    return false;
+  };
+})();
+"""
+
+# Scenario modules by path; they only define run(), so reusing them across runs is safe
+_SCENARIO_CACHE: Dict[Path, ModuleType] = {}
 
 
 def _ts() -> str:
@@ -77,18 +135,28 @@ def _format_location(msg: ConsoleMessage) -> str:
     return "unknown"
 
 
+def _format_arg(val: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(val, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return repr(val)
+
+
 async def _serialize_console_args(msg: ConsoleMessage, per_arg_timeout_ms: int = 300) -> List[str]:
     out: List[str] = []
     for i, arg in enumerate(msg.args):
         try:
             val = await arg.json_value(timeout=per_arg_timeout_ms)
-            out.append(f"arg{i}={val!r}")
         except Exception:
             try:
                 preview = await arg.evaluate("a => String(a)")
                 out.append(f"arg{i}={preview!r}")
             except Exception:
                 out.append(f"arg{i}=<unserializable>")
+        else:
+            out.append(f"arg{i}={_format_arg(val)}")
     return out
 
 
@@ -100,99 +168,104 @@ def _request_brief(req: Request) -> str:
     return f"{req.method} {req.url} ({rt})"
 
 
-def write_log_line(log_file: Path, line: str) -> None:
+async def _new_context(browser):
+    context = await browser.new_context()
+    # Inject BEFORE any page scripts run, for every page of the context
+    await context.add_init_script(_INIT_SCRIPT)
+    return context
+
+
+def _is_static_asset(req: Request) -> bool:
+    try:
+        return req.resource_type in _STATIC_RESOURCE_TYPES
+    except Exception:
+        return False
+
+
+async def _save_failure_screenshot(page: Page, scenario_name: str, log_lines: List[str]) -> None:
+    path = Path(__file__).parent / "logs" / f"{scenario_name}.png"
+    try:
+        await page.screenshot(path=str(path))
+    except Exception as e:
+        write_log_line(log_lines, f"[{_tss()}] Could not save screenshot: {_safe_str(e)}")
+    else:
+        write_log_line(log_lines, f"[{_tss()}] Screenshot: {path}")
+
+
+def write_log_line(log_lines: List[str], line: str) -> None:
+    """Print a log line now; it is written to the log file when the scenario ends."""
     print(line)
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
-        f.flush()
+    log_lines.append(line)
 
 
 def load_scenarios(scenario_filter: Optional[str] = None) -> List[Path]:
     scenarios_dir = Path(__file__).parent / "scenarios"
-    scenarios = []
-    for py_file in scenarios_dir.glob("*.py"):
-        if py_file.name != "__init__.py":
-            if scenario_filter is None or py_file.stem == scenario_filter:
-                scenarios.append(py_file)
-    return sorted(scenarios)
+    wanted = None if scenario_filter is None else f"{scenario_filter}.py"
+    with os.scandir(scenarios_dir) as it:
+        names = [
+            e.name for e in it
+            if e.name.endswith(".py") and e.name != "__init__.py"
+            and (wanted is None or e.name == wanted) and e.is_file()
+        ]
+    return [scenarios_dir / name for name in sorted(names)]
 
 
-async def run_scenario(scenario_path: Path, browser) -> int:
+async def run_scenario(scenario_path: Path, browser, context) -> int:
     scenario_name = scenario_path.stem
     logs_dir = Path(__file__).parent / "logs"
     logs_dir.mkdir(exist_ok=True)
 
-    log_file = logs_dir / f"{scenario_name}.log"
+    log_path = logs_dir / f"{scenario_name}.log"
 
-    # Delete old log files for this scenario
-    for old_log in logs_dir.glob(f"{scenario_name}.log"):
-        old_log.unlink()
-
-    # Write scenario header
     header = f"=== Scenario: {scenario_name} ===\nTimestamp: {_ts()}\nStart URL: {START_URL}\n{'='*50}\n"
-    write_log_line(log_file, header)
-    print(f"Running scenario: {scenario_name}")
-
-    # Load scenario module
-    spec = importlib.util.spec_from_file_location(scenario_name, scenario_path)
-    if not spec or not spec.loader:
-        error_msg = f"Failed to load scenario: {scenario_name}"
-        write_log_line(log_file, f"[{_tss()}] ERROR: {error_msg}")
-        print(error_msg)
-        return 1
+    log_lines: List[str] = []
+    write_log_line(log_lines, header)
 
-    module = importlib.util.module_from_spec(spec)
+    # Lines are collected in memory and written in one go, replacing any log
+    # from a previous run
     try:
-        spec.loader.exec_module(module)
-        if not hasattr(module, 'run'):
-            error_msg = f"Scenario {scenario_name} missing 'run' function"
-            write_log_line(log_file, f"[{_tss()}] ERROR: {error_msg}")
-            print(error_msg)
-            return 1
-    except Exception as e:
-        error_msg = f"Failed to import scenario {scenario_name}: {_safe_str(e)}"
-        write_log_line(log_file, f"[{_tss()}] ERROR: {error_msg}")
-        print(error_msg)
-        return 1
+        return await _run_scenario(scenario_path, browser, context, log_lines)
+    finally:
+        log_path.write_text("\n".join(log_lines) + "\n", encoding="utf-8")
 
-    context = await browser.new_context()
-    page = await context.new_page()
 
-    # Inject BEFORE any page scripts run: surface unhandled errors/rejections into console.error
-    await page.add_init_script(
-        """
-(() => {
-  const safeStringify = (v) => {
-    try { return typeof v === 'string' ? v : JSON.stringify(v); }
-    catch { try { return String(v); } catch { return '<unprintable>'; } }
-  };
+async def _run_scenario(scenario_path: Path, browser, context, log_lines: List[str]) -> int:
+    scenario_name = scenario_path.stem
+    print(f"Running scenario: {scenario_name}")
 
-  window.addEventListener('error', (e) => {
-    // Resource errors sometimes have no stack; still log them
-    const msg = e && e.message ? e.message : 'window error event';
-    const file = e && e.filename ? e.filename : '';
-    const line = e && typeof e.lineno === 'number' ? e.lineno : '';
-    const col  = e && typeof e.colno === 'number' ? e.colno : '';
-    const err  = e && e.error ? e.error : null;
-    const stack = err && err.stack ? err.stack : '';
-    console.error('[window.error]', msg, file, line, col, stack);
-  }, true);
+    # Load scenario module (imported once per process)
+    module = _SCENARIO_CACHE.get(scenario_path)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(scenario_name, scenario_path)
+        if not spec or not spec.loader:
+            error_msg = f"Failed to load scenario: {scenario_name}"
+            write_log_line(log_lines, f"[{_tss()}] ERROR: {error_msg}")
+            print(error_msg)
+            return 1
 
-  window.addEventListener('unhandledrejection', (e) => {
-    const r = e ? e.reason : null;
-    const reason = r && r.stack ? r.stack : safeStringify(r);
-    console.error('[unhandledrejection]', reason);
-  });
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+            if not hasattr(module, 'run'):
+                error_msg = f"Scenario {scenario_name} missing 'run' function"
+                write_log_line(log_lines, f"[{_tss()}] ERROR: {error_msg}")
+                print(error_msg)
+                return 1
+        except Exception as e:
+            error_msg = f"Failed to import scenario {scenario_name}: {_safe_str(e)}"
+            write_log_line(log_lines, f"[{_tss()}] ERROR: {error_msg}")
+            print(error_msg)
+            return 1
+        _SCENARIO_CACHE[scenario_path] = module
 
-  // Optional: catch synchronous exceptions not routed elsewhere
-  window.onerror = function(message, source, lineno, colno, error) {
-    const stack = error && error.stack ? error.stack : '';
-    console.error('[window.onerror]', message, source, lineno, colno, stack);
-    return false;
-  };
-})();
-"""
-    )
+    own_context = None
+    if getattr(module, "ISOLATED_CONTEXT", False):
+        own_context = context = await _new_context(browser)
+    page = await context.new_page()
+    # Scenario-specific page helpers, defined before any page script runs
+    init_script = getattr(module, "INIT_SCRIPT", None)
+    if init_script:
+        await page.add_init_script(init_script)
 
     console_logs: List[Dict[str, Any]] = []
 
@@ -206,37 +279,38 @@ async def run_scenario(scenario_path: Path, browser) -> int:
                 "args": [],
             }
 
-            if msg.args:
+            # Args cost an IPC round-trip each; only worth it for problems
+            if msg.args and entry["level"] in _SERIALIZE_ARGS_LEVELS:
                 entry["args"] = await _serialize_console_args(msg)
 
             console_logs.append(entry)
 
             header = f"[{entry['timestamp']}] [CONSOLE:{entry['level'].upper()}] {entry['text']}"
             print(header)
-            write_log_line(log_file, header)
+            write_log_line(log_lines, header)
 
             if entry["location"] and entry["location"] != "unknown":
                 loc_line = f"    Location: {entry['location']}"
                 print(loc_line)
-                write_log_line(log_file, loc_line)
+                write_log_line(log_lines, loc_line)
 
             if entry["args"]:
                 args_line = "    Args: " + " | ".join(entry["args"])
                 print(args_line)
-                write_log_line(log_file, args_line)
+                write_log_line(log_lines, args_line)
 
         except Exception as e:
             line = f"[{_tss()}] [ERROR] console handler: {_safe_str(e)}"
             print(line)
-            write_log_line(log_file, line)
+            write_log_line(log_lines, line)
 
     async def on_page_error(error: Error) -> None:
         line = f"[{_tss()}] [PAGEERROR] {_safe_str(error)}"
-        write_log_line(log_file, line)
+        write_log_line(log_lines, line)
 
     async def on_request(req: Request) -> None:
         line = f"[{_tss()}] [REQUEST] {_request_brief(req)}"
-        write_log_line(log_file, line)
+        write_log_line(log_lines, line)
 
     async def on_response(resp) -> None:
         try:
@@ -244,12 +318,12 @@ async def run_scenario(scenario_path: Path, browser) -> int:
             line = f"[{_tss()}] [RESPONSE] {resp.status} {req.method} {resp.url}"
         except Exception:
             line = f"[{_tss()}] [RESPONSE] {_safe_str(resp)}"
-        write_log_line(log_file, line)
+        write_log_line(log_lines, line)
 
         # Extra: flag HTTP errors immediately (many "console errors" are really 4xx/5xx)
         try:
             if resp.status >= 400:
-                write_log_line(log_file, f"[{_tss()}] [HTTPERROR] {resp.status} {resp.url}")
+                write_log_line(log_lines, f"[{_tss()}] [HTTPERROR] {resp.status} {resp.url}")
         except Exception:
             pass
 
@@ -262,63 +336,106 @@ async def run_scenario(scenario_path: Path, browser) -> int:
             except Exception:
                 fail_text = _safe_str(failure)
         line = f"[{_tss()}] [REQUESTFAILED] {_request_brief(request)} {fail_text}".rstrip()
-        write_log_line(log_file, line)
+        write_log_line(log_lines, line)
+
+    # Page events go through one bounded queue and a single consumer task rather
+    # than a task per event; events arriving while it is full are dropped (counted)
+    events: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+    dropped = 0
+
+    def enqueue(handler, obj) -> None:
+        nonlocal dropped
+        try:
+            events.put_nowait((handler, obj))
+        except asyncio.QueueFull:
+            dropped += 1
+
+    async def consume_events() -> None:
+        while True:
+            item = await events.get()
+            if item is None:
+                return
+            handler, obj = item
+            try:
+                await handler(obj)
+            except Exception as e:
+                write_log_line(log_lines, f"[{_tss()}] [ERROR] event handler: {_safe_str(e)}")
 
-    page.on("console", lambda m: asyncio.create_task(on_console(m)))
-    page.on("pageerror", lambda e: asyncio.create_task(on_page_error(e)))
-    page.on("request", lambda r: asyncio.create_task(on_request(r)))
-    page.on("response", lambda r: asyncio.create_task(on_response(r)))
-    page.on("requestfailed", lambda r: asyncio.create_task(on_request_failed(r)))
+    consumer = asyncio.create_task(consume_events())
 
+    page.on("console", lambda m: enqueue(on_console, m))
+    page.on("pageerror", lambda e: enqueue(on_page_error, e))
+    page.on("request", lambda r: None if _is_static_asset(r) else enqueue(on_request, r))
+    page.on("response", lambda r: None if r.status < 400 and _is_static_asset(r.request) else enqueue(on_response, r))
+    page.on("requestfailed", lambda r: enqueue(on_request_failed, r))
+
+    start_time = time.perf_counter()
     try:
-        start_time = time.time()
-        write_log_line(log_file, f"[{_tss()}] STEP start")
+        write_log_line(log_lines, f"[{_tss()}] STEP start")
 
         # Initial navigation with localhost validation
         if not _is_allowed_start_url(START_URL):
             raise ValueError(f"Refusing to navigate to non-localhost start url: {START_URL}")
 
-        write_log_line(log_file, f"[{_tss()}] Navigating to {START_URL}")
+        write_log_line(log_lines, f"[{_tss()}] Navigating to {START_URL}")
         resp = await page.goto(START_URL, wait_until="domcontentloaded", timeout=30_000)
         status = resp.status if resp else None
-        write_log_line(log_file, f"[{_tss()}] Navigation status: {status if status is not None else 'No response'}")
+        write_log_line(log_lines, f"[{_tss()}] Navigation status: {status if status is not None else 'No response'}")
 
         # Create a logging function for the scenario
         def scenario_log(message: str) -> None:
             log_line = f"[{_tss()}] SCENARIO: {message}"
-            write_log_line(log_file, log_line)
+            write_log_line(log_lines, log_line)
 
-        # Run the scenario and check result
+        # Run the scenario and check result (a bool, or a ScenarioResult)
         scenario_result = await module.run(page, scenario_log)
 
-        elapsed_ms = int((time.time() - start_time) * 1000)
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+
+        if isinstance(scenario_result, ScenarioResult):
+            timings = ", ".join(f"{name}={ms:.0f}ms" for name, ms in scenario_result.step_timings.items())
+            write_log_line(log_lines, f"[{_tss()}] STEP TIMINGS: {timings}")
+            if scenario_result.failure_step is not None:
+                write_log_line(log_lines, f"[{_tss()}] FAILED STEP: {scenario_result.failure_step}")
+            scenario_result = scenario_result.ok
 
         if scenario_result is True:
-            write_log_line(log_file, f"[{_tss()}] SCENARIO SUCCESS")
-            write_log_line(log_file, f"[{_tss()}] STEP end ({elapsed_ms}ms)")
+            write_log_line(log_lines, f"[{_tss()}] SCENARIO SUCCESS")
+            write_log_line(log_lines, f"[{_tss()}] STEP end ({elapsed_ms}ms)")
             print(f"✓ Scenario {scenario_name} PASSED in {elapsed_ms}ms")
             return 0
         else:
-            write_log_line(log_file, f"[{_tss()}] SCENARIO FAILED")
-            write_log_line(log_file, f"[{_tss()}] STEP end ({elapsed_ms}ms)")
+            write_log_line(log_lines, f"[{_tss()}] SCENARIO FAILED")
+            write_log_line(log_lines, f"[{_tss()}] STEP end ({elapsed_ms}ms)")
             print(f"✗ Scenario {scenario_name} FAILED in {elapsed_ms}ms")
             return 1
 
     except Exception as e:
-        elapsed_ms = int((time.time() - time.time()) * 1000)  # Rough estimate
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
         error_msg = f"[{_tss()}] SCENARIO FAILED: {_safe_str(e)}"
-        write_log_line(log_file, error_msg)
-        write_log_line(log_file, f"[{_tss()}] STEP end ({elapsed_ms}ms)")
+        write_log_line(log_lines, error_msg)
+        write_log_line(log_lines, "".join(traceback.format_exception(e)).rstrip())
+        await _save_failure_screenshot(page, scenario_name, log_lines)
+        write_log_line(log_lines, f"[{_tss()}] STEP end ({elapsed_ms}ms)")
         print(f"✗ Scenario {scenario_name} failed: {_safe_str(e)}")
         return 1
 
     finally:
-        await context.close()
+        # Drain what the page already reported before tearing the page down
+        await events.put(None)
+        await consumer
+        if dropped:
+            write_log_line(log_lines, f"[{_tss()}] [WARN] {dropped} page events dropped (event queue full)")
+        await page.close()
+        if own_context is not None:
+            await own_context.close()
 
 
 async def main() -> int:
     parser = argparse.ArgumentParser(description="Frontend E2E Test Runner")
     parser.add_argument("--scenario", help="Run only the specified scenario (e.g., scenario_1_page_load)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Max scenarios running at the same time (default: {DEFAULT_CONCURRENCY})")
     args = parser.parse_args()
 
     print("Starting E2E test runner...")
@@ -339,22 +456,34 @@ async def main() -> int:
 
     async with async_playwright() as p:
         browser = await p.firefox.launch(
-            headless=False,
-            args=[
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-            ],
+            # Headed locally so runs can be watched; headless in CI
+            headless=bool(os.environ.get("CI")),
+            firefox_user_prefs={
+                "media.volume_scale": "0.0",
+                "general.smoothScroll": False,
+                "toolkit.cosmeticAnimations.enabled": False,
+            },
         )
 
+        # Scenarios share one context (cookies/cache) but each has its own page
+        # and log file, so they can overlap
+        context = await _new_context(browser)
+        semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+        async def run_limited(scenario_path: Path) -> int:
+            async with semaphore:
+                return await run_scenario(scenario_path, browser, context)
+
+        scenario_names = [scenario_path.stem for scenario_path in scenarios]
+        outcomes = await asyncio.gather(*(run_limited(path) for path in scenarios), return_exceptions=True)
         results = []
-        scenario_names = []
-        for scenario_path in scenarios:
-            scenario_names.append(scenario_path.stem)
-            result = await run_scenario(scenario_path, browser)
-            results.append(result)
+        for name, outcome in zip(scenario_names, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"✗ Scenario {name} crashed: {_safe_str(outcome)}")
+                outcome = 1
+            results.append(outcome)
 
+        await context.close()
         await browser.close()
 
     # Summary
@@ -0,0 +1,35 @@
+"""E2E scenarios run by tests/runner.py."""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    """
+    Structured outcome of a scenario run.
+
+    Scenarios may return this instead of a bare bool: the runner logs the
+    per-step durations and, on failure, which step failed.
+    """
+    ok: bool = False
+    step_timings: Dict[str, float] = field(default_factory=dict)  # step name -> ms
+    failure_step: Optional[str] = None
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as `name`. If it raises, record it as the failing
+        step and add the step name as a note on the exception, which propagates.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.failure_step = name
+            e.add_note(f"scenario step: {name}")
+            raise
+        finally:
+            self.step_timings[name] = (time.perf_counter() - start) * 1000
@@ -11,7 +11,7 @@ async def run(page: Page, log) -> bool:
     """Run the page load scenario. Returns True if successful."""
     try:
         # Wait for the page to be fully loaded
-        await page.wait_for_load_state("networkidle")
+        await page.wait_for_load_state("load")
         log("Page loaded successfully")
 
         # Verify we can get the page title
@@ -11,7 +11,7 @@ async def run(page: Page, log) -> bool:
     """Run the marker click scenario. Returns True if successful."""
     try:
         # Wait for the page to be fully loaded
-        await page.wait_for_load_state("networkidle")
+        await page.wait_for_load_state("load")
         log("Page loaded successfully")
 
         # Wait for map container to be present
@@ -23,36 +23,39 @@ async def run(page: Page, log) -> bool:
         await page.wait_for_selector(".leaflet-marker-icon.leaflet-interactive", timeout=30000)
         log("Interactive markers found")
 
-        # Wait a moment for popup event handlers to be attached
+        # Wait for popup event handlers to be attached
         log("Waiting for popup system to be ready...")
-        await page.wait_for_timeout(2000)
+        await page.wait_for_function("window.__popupHandlersReady === true", timeout=5000)
         log("Popup system ready")
 
         # Find all leaflet marker icons
         marker_icons = page.locator(".leaflet-marker-icon.leaflet-interactive")
 
-        # Find the first marker that is actually visible in the viewport
-        visible_marker = None
+        # Find the first marker that is actually visible in the viewport, in one
+        # round-trip instead of is_visible()/bounding_box() per marker
         marker_count = await marker_icons.count()
         log(f"Found {marker_count} marker icons total")
 
-        for i in range(marker_count):
-            marker = marker_icons.nth(i)
-            # Check if the marker is visible in the viewport
-            if await marker.is_visible():
-                bounding_box = await marker.bounding_box()
-                if bounding_box and bounding_box['x'] >= 0 and bounding_box['y'] >= 0:
-                    # Additional check: ensure marker is within viewport bounds
-                    viewport = page.viewport_size
-                    if (bounding_box['x'] + bounding_box['width'] <= viewport['width'] and
-                        bounding_box['y'] + bounding_box['height'] <= viewport['height']):
-                        visible_marker = marker
-                        log(f"Found visible marker icon at index {i}")
-                        break
+        index = await page.evaluate("""
+            () => {
+                const vw = window.innerWidth, vh = window.innerHeight;
+                const els = document.querySelectorAll('.leaflet-marker-icon.leaflet-interactive');
+                for (let i = 0; i < els.length; i++) {
+                    const r = els[i].getBoundingClientRect();
+                    if (r.width > 0 && r.height > 0 && r.x >= 0 && r.y >= 0 &&
+                        r.x + r.width <= vw && r.y + r.height <= vh &&
+                        getComputedStyle(els[i]).visibility !== 'hidden') {
+                        return i;
+                    }
+                }
+                return -1;
+            }
+        """)
 
-        if not visible_marker:
+        if index < 0:
             raise Exception("No marker found in viewport")
-        log(f"Found visible marker icon at index {i}")
+        visible_marker = marker_icons.nth(index)
+        log(f"Found visible marker icon at index {index}")
         log(f"Visible marker icon: {visible_marker}")
         # Click on the visible marker
         await visible_marker.click()
@@ -5,90 +5,101 @@ Load page, open layers panel, select circles mode radio button,
 and verify that circles mode is enabled.
 """
 
-from playwright.async_api import Page
-
-
-async def run(page: Page, log) -> bool:
-    """Run the enable circles mode scenario. Returns True if successful."""
-    try:
-        # Wait for the page to be fully loaded
-        await page.wait_for_load_state("networkidle")
-        log("Page loaded successfully")
-
-        # Wait for map container to be present
-        await page.wait_for_selector("#map", timeout=10000)
-        log("Map container found")
-
-        # Open the layers panel by clicking the layers button label
-        layers_button_label = page.locator("label[title='Layers']")
-        await page.wait_for_selector("label[title='Layers']", timeout=5000)
-        await layers_button_label.click()
-        log("Layers panel opened")
-
-        # Wait for the layers panel to be visible
-        await page.wait_for_selector("#layers_panel", timeout=5000)
-        log("Layers panel visible")
-
-        # Get circle count before enabling circles mode
-        circles_before = await page.evaluate("""
-            () => {
-                if (typeof window.getCircleCount === 'function') {
-                    return window.getCircleCount();
-                }
-                return -1; // Function not available
-            }
-        """)
-
-        if circles_before < 0:
-            raise Exception("Circle counting function not available")
-
-        log(f"Circles before enabling mode: {circles_before}")
-
-        # Find and click the circles mode radio button
-        circles_radio = page.locator("#marker_mode_circles")
-        if not await circles_radio.is_visible():
+import os
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from scenarios import ScenarioResult
+
+# Timeouts (ms): page/app readiness, and each UI interaction after that
+LOAD_TIMEOUT = int(os.getenv("SCENARIO_LOAD_TIMEOUT_MS", "10000"))
+UI_TIMEOUT = int(os.getenv("SCENARIO_UI_TIMEOUT_MS", "2000"))
+
+LAYERS_BUTTON = "label[title='Layers']"
+CIRCLES_RADIO = "#marker_mode_circles"
+
+# Injected by the runner before navigation. window.__circleProbe() reads the
+# circle-mode state in one round-trip; it is only called after the "app ready"
+# step has seen map.js define the two functions it wraps
+INIT_SCRIPT = """
+window.__circleProbe = () => ({
+    count: window.getCircleCount(),
+    enabled: window.isCircleModeEnabled(),
+});
+"""
+_PROBE_JS = "() => window.__circleProbe()"
+
+
+async def run(page: Page, log) -> ScenarioResult:
+    """
+    Run the enable circles mode scenario. Returns a ScenarioResult with ok=True
+    if successful; failures raise, annotated with the step that failed.
+    """
+    result = ScenarioResult()
+
+    # Wait for map container to be present
+    with result.step("map"):
+        await page.wait_for_selector("#map", timeout=LOAD_TIMEOUT)
+    log("Map container found")
+
+    # Wait until the circle-mode API the scenario relies on is defined,
+    # instead of for network idle (which tile/poll traffic can delay)
+    with result.step("app ready"):
+        await page.wait_for_function(
+            "() => typeof window.getCircleCount === 'function'"
+            " && typeof window.isCircleModeEnabled === 'function'",
+            timeout=LOAD_TIMEOUT,
+        )
+    log("Page loaded successfully")
+
+    # Open the layers panel by clicking the layers button label (click()
+    # waits for the label itself; the panel is awaited implicitly by the
+    # radio check() below)
+    with result.step("open layers"):
+        await page.locator(LAYERS_BUTTON).click(timeout=UI_TIMEOUT)
+    log("Layers panel opened")
+
+    # Get circle count before enabling circles mode
+    with result.step("count before"):
+        circles_before = (await page.evaluate(_PROBE_JS))["count"]
+
+    log(f"Circles before enabling mode: {circles_before}")
+
+    # Find and click the circles mode radio button
+    # check() waits for the radio to be visible and stable, so there is no
+    # separate visibility probe to race against
+    with result.step("select circles"):
+        circles_radio = page.locator(CIRCLES_RADIO)
+        try:
+            await circles_radio.check(timeout=UI_TIMEOUT)
+        except PlaywrightTimeoutError:
             raise Exception("Circles mode radio button not found")
-        await circles_radio.check()
-        log("Selected circles mode radio button")
-
-        # Wait a moment for the mode change to take effect
-        await page.wait_for_timeout(1000)
-        log("Waiting for circles mode to be applied")
-
-        # Verify that circles mode is enabled
-        is_circles_enabled = await page.evaluate("""
-            () => {
-                if (typeof window.isCircleModeEnabled === 'function') {
-                    return window.isCircleModeEnabled();
-                }
-                return false;
-            }
-        """)
-
-        if not is_circles_enabled:
-            raise Exception("Circles mode was not enabled after selecting the radio button")
-
-        # Get circle count after enabling circles mode
-        circles_after = await page.evaluate("""
-            () => {
-                if (typeof window.getCircleCount === 'function') {
-                    return window.getCircleCount();
-                }
-                return -1; // Function not available
-            }
-        """)
-
-        log(f"Circles after enabling mode: {circles_after}")
-
-        # Verify that enabling circles mode actually added circles to the map
-        if circles_after <= circles_before:
+    log("Selected circles mode radio button")
+
+    # Wait until the mode is applied and circles are drawn; the predicate
+    # returns the new circle count
+    log("Waiting for circles mode to be applied")
+    with result.step("circles drawn"):
+        try:
+            handle = await page.wait_for_function(
+                "(before) => window.isCircleModeEnabled()"
+                " && window.getCircleCount() > before && window.getCircleCount()",
+                arg=circles_before,
+                timeout=UI_TIMEOUT,
+            )
+        except PlaywrightTimeoutError:
+            state = await page.evaluate(_PROBE_JS)
+            if not state["enabled"]:
+                raise Exception("Circles mode was not enabled after selecting the radio button")
+            circles_after = state["count"]
             raise Exception(f"Enabling circles mode did not add circles to the map (before: {circles_before}, after: {circles_after})")
+        circles_after = await handle.json_value()
+
+    log(f"Circles after enabling mode: {circles_after}")
 
-        log(f"Circles mode successfully added {circles_after - circles_before} circles to the map")
+    log(f"Circles mode successfully added {circles_after - circles_before} circles to the map")
 
-        log("Circles mode successfully enabled and circles are drawn on the map - test successful!")
-        return True
+    log("Circles mode successfully enabled and circles are drawn on the map - test successful!")
+    result.ok = True
 
-    except Exception as e:
-        log(f"Test failed: {e}")
-        return False
\ No newline at end of file
+    return result